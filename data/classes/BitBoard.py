@@ -0,0 +1,589 @@
+# /* BitBoard.py
+from array import array
+
+from data.classes.move_tables import (
+    WHITE,
+    BLACK,
+    MOVE_TUPLES,
+    KNIGHT_TARGETS,
+    KING_TARGETS,
+    STAR_TARGETS,
+    JOKER_TARGETS,
+    ROOK_RAYS,
+    BISHOP_RAYS,
+    QUEEN_RAYS,
+    ROOK_RAY_MASKS,
+    BISHOP_RAY_MASKS,
+    QUEEN_RAY_MASKS,
+    PAWN_SINGLE_PUSHES,
+    PAWN_PUSHES,
+    PAWN_CAPTURES,
+    PAWN_ATTACKS,
+    KNIGHT_ATTACKS,
+    KING_ATTACKS,
+    STAR_ATTACKS,
+    JOKER_ATTACKS,
+    PROMOTION_MASK,
+    BOARD_MASK,
+    NOT_FILE_0,
+    NOT_FILE_5,
+)
+from data.classes.zobrist import PIECE_KEYS, UNMOVED_PAWN_KEYS, BLACK_TO_MOVE_KEY
+from data.classes.moves import PROMOTION_FLAG, SQUARES_MASK
+
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, STAR, JOKER = range(8)
+EMPTY = -1
+
+# piece notation as used by Piece.notation and get_board_state
+NOTATION = " NBRQKSJ"
+NOTATION_TO_TYPE = {notation: piece_type for piece_type, notation in enumerate(NOTATION)}
+COLOR_INDEX = {"white": WHITE, "black": BLACK}
+COLOR_NAMES = ("white", "black")
+
+# material values, the same as the bots' SCORES_DICT
+PIECE_VALUES = (1, 3, 3, 5, 9, 100, 5, 9)
+# victims most valuable first (the king is handled on its own), attackers least valuable first
+VICTIM_ORDER = (QUEEN, JOKER, ROOK, STAR, BISHOP, KNIGHT, PAWN)
+ATTACKER_ORDER = (PAWN, KNIGHT, BISHOP, ROOK, STAR, QUEEN, JOKER, KING)
+
+LEAPER_TARGETS = {
+    KNIGHT: KNIGHT_TARGETS,
+    KING: KING_TARGETS,
+    STAR: STAR_TARGETS,
+    JOKER: JOKER_TARGETS,
+}
+SLIDER_RAYS = {
+    BISHOP: BISHOP_RAYS,
+    ROOK: ROOK_RAYS,
+    QUEEN: QUEEN_RAYS,
+}
+LEAPER_ATTACKS = {
+    KNIGHT: KNIGHT_ATTACKS,
+    KING: KING_ATTACKS,
+    STAR: STAR_ATTACKS,
+    JOKER: JOKER_ATTACKS,
+}
+SLIDER_RAY_MASKS = {
+    BISHOP: BISHOP_RAY_MASKS,
+    ROOK: ROOK_RAY_MASKS,
+    QUEEN: QUEEN_RAY_MASKS,
+}
+
+
+class BitBoard:
+    """
+    Compact position: one 36-bit int per (color, piece type), plus occupancy
+    and a square -> piece lookup. Square i is (i % 6, i // 6).
+    Nothing in here touches pygame, so bots can generate moves from it directly.
+    """
+    def __init__(self):
+        self.pieces = [[0] * 8, [0] * 8]
+        self.occupied = [0, 0]
+        # color << 3 | piece type, or EMPTY
+        self.mailbox = [EMPTY] * 36
+        # pieces that have not moved yet (only matters for the pawn double step)
+        self.unmoved = 0
+        self.turn = WHITE
+        # Zobrist key of the position, updated on every put/remove/turn change
+        self.key = 0
+        self.history = []
+        # tables from evaluation.py and their sums over the pieces on the board,
+        # updated on every put/remove like the key
+        self.eval_tables = []
+        self.eval_scores = []
+        # get_attack_map's cache: the key each color's map was built for
+        self.attack_keys = [None, None]
+        self.attack_maps = [0, 0]
+
+    def __getstate__(self):
+        # get_eval_score finds its tables by identity, which a pickled copy of a table
+        # would not match; the copy sums each table again on first use instead
+        state = self.__dict__.copy()
+        state["eval_tables"] = []
+        state["eval_scores"] = []
+        return state
+
+    @classmethod
+    def from_board(cls, board):
+        bitboard = cls()
+        for square in board.squares:
+            piece = square.occupying_piece
+            if piece is not None:
+                bitboard.put(
+                    square.y * 6 + square.x,
+                    COLOR_INDEX[piece.color],
+                    NOTATION_TO_TYPE[piece.notation],
+                    piece.has_moved,
+                )
+        bitboard.set_turn(COLOR_INDEX[board.turn])
+        return bitboard
+
+    def set_turn(self, color):
+        if color != self.turn:
+            self.key ^= BLACK_TO_MOVE_KEY
+            self.turn = color
+
+    def put(self, square, color, piece_type, moved=False):
+        bit = 1 << square
+        self.pieces[color][piece_type] |= bit
+        self.occupied[color] |= bit
+        self.mailbox[square] = color << 3 | piece_type
+        self.key ^= PIECE_KEYS[color << 3 | piece_type][square]
+        if self.eval_tables:
+            index = (color << 3 | piece_type) * 36 + square
+            scores = self.eval_scores
+            for i, table in enumerate(self.eval_tables):
+                scores[i] += table[index]
+        if not moved:
+            self.unmoved |= bit
+            if piece_type == PAWN:
+                self.key ^= UNMOVED_PAWN_KEYS[square]
+
+    def remove(self, square):
+        code = self.mailbox[square]
+        if code == EMPTY:
+            return
+        self.key ^= PIECE_KEYS[code][square]
+        if code & 7 == PAWN and self.unmoved >> square & 1:
+            self.key ^= UNMOVED_PAWN_KEYS[square]
+        if self.eval_tables:
+            index = code * 36 + square
+            scores = self.eval_scores
+            for i, table in enumerate(self.eval_tables):
+                scores[i] -= table[index]
+        mask = ~(1 << square)
+        self.pieces[code >> 3][code & 7] &= mask
+        self.occupied[code >> 3] &= mask
+        self.unmoved &= mask
+        self.mailbox[square] = EMPTY
+
+    def move_piece(self, start, end):
+        # captures whatever is on end and promotes pawns that reach the last rank
+        code = self.mailbox[start]
+        color, piece_type = code >> 3, code & 7
+        self.remove(end)
+        self.remove(start)
+        if piece_type == PAWN and PROMOTION_MASK[color] >> end & 1:
+            piece_type = JOKER
+        self.put(end, color, piece_type, True)
+        self.set_turn(color ^ 1)
+
+    def push(self, start, end):
+        self.history.append(
+            (start, end, self.mailbox[start], self.mailbox[end], self.unmoved, self.turn, self.key)
+        )
+        self.move_piece(start, end)
+
+    def push_null(self):
+        # pass the turn without moving (null-move pruning); undone by pop()
+        self.history.append(None)
+        self.set_turn(self.turn ^ 1)
+
+    def pop(self):
+        entry = self.history.pop()
+        if entry is None:
+            self.set_turn(self.turn ^ 1)
+            return
+        start, end, code, captured, unmoved, turn, key = entry
+        self.remove(end)
+        self.put(start, code >> 3, code & 7)
+        if captured != EMPTY:
+            self.put(end, captured >> 3, captured & 7)
+        self.unmoved = unmoved
+        self.turn = turn
+        self.key = key
+
+    def compute_key(self):
+        # full recomputation of self.key, for checking the incremental updates
+        key = BLACK_TO_MOVE_KEY if self.turn == BLACK else 0
+        for square, code in enumerate(self.mailbox):
+            if code != EMPTY:
+                key ^= PIECE_KEYS[code][square]
+                if code & 7 == PAWN and self.unmoved >> square & 1:
+                    key ^= UNMOVED_PAWN_KEYS[square]
+        return key
+
+    def get_eval_score(self, table):
+        # sum of an evaluation.py table over the pieces on the board (white minus black);
+        # the table is summed once on first use and kept up to date from then on
+        for i, added in enumerate(self.eval_tables):
+            if added is table:
+                return self.eval_scores[i]
+        score = 0
+        for square, code in enumerate(self.mailbox):
+            if code != EMPTY:
+                score += table[code * 36 + square]
+        self.eval_tables.append(table)
+        self.eval_scores.append(score)
+        return score
+
+    def get_piece_targets(self, square):
+        # target squares of the piece on square, in the same order as Piece.get_valid_moves
+        code = self.mailbox[square]
+        color, piece_type = code >> 3, code & 7
+        own = self.occupied[color]
+        output = []
+        if piece_type == PAWN:
+            occupied = own | self.occupied[color ^ 1]
+            if self.unmoved >> square & 1:
+                pushes = PAWN_PUSHES[color][square]
+            else:
+                pushes = PAWN_SINGLE_PUSHES[color][square]
+            for target in pushes:
+                if occupied >> target & 1:
+                    break
+                output.append(target)
+            enemy = self.occupied[color ^ 1]
+            for target in PAWN_CAPTURES[color][square]:
+                if enemy >> target & 1:
+                    output.append(target)
+        elif piece_type in LEAPER_TARGETS:
+            for target in LEAPER_TARGETS[piece_type][square]:
+                if not own >> target & 1:
+                    output.append(target)
+        else:
+            enemy = self.occupied[color ^ 1]
+            for ray in SLIDER_RAYS[piece_type][square]:
+                for target in ray:
+                    if own >> target & 1:
+                        break
+                    output.append(target)
+                    if enemy >> target & 1:
+                        break
+        return output
+
+    def count_piece_moves(self, square):
+        # len(self.get_piece_targets(square)), without building the list
+        code = self.mailbox[square]
+        color, piece_type = code >> 3, code & 7
+        own = self.occupied[color]
+        enemy = self.occupied[color ^ 1]
+        if piece_type in LEAPER_ATTACKS:
+            return (LEAPER_ATTACKS[piece_type][square] & ~own).bit_count()
+        if piece_type == PAWN:
+            count = (PAWN_ATTACKS[color][square] & enemy).bit_count()
+            occupied = own | enemy
+            if self.unmoved >> square & 1:
+                pushes = PAWN_PUSHES[color][square]
+            else:
+                pushes = PAWN_SINGLE_PUSHES[color][square]
+            for target in pushes:
+                if occupied >> target & 1:
+                    break
+                count += 1
+            return count
+        occupied = own | enemy
+        count = 0
+        for mask, step in SLIDER_RAY_MASKS[piece_type][square]:
+            blockers = mask & occupied
+            if not blockers:
+                count += mask.bit_count()
+            else:
+                if step > 0:
+                    first = (blockers & -blockers).bit_length() - 1
+                else:
+                    first = blockers.bit_length() - 1
+                # the empty squares before the blocker, plus the blocker if it can be captured
+                count += (first - square) // step - 1 + (enemy >> first & 1)
+        return count
+
+    def count_moves(self, color):
+        # len(self.get_all_valid_moves(color)), without building any lists
+        color = COLOR_INDEX[color]
+        pieces = self.pieces[color]
+        own = self.occupied[color]
+        enemy = self.occupied[color ^ 1]
+        count = 0
+        pawns = pieces[PAWN]
+        if pawns:
+            # all pawns at once: one shift per kind of step
+            empty = ~(own | enemy) & BOARD_MASK
+            unmoved = pawns & self.unmoved
+            if color == WHITE:
+                single = pawns >> 6 & empty
+                double = (single & unmoved >> 6) >> 6 & empty
+                captures = (pawns & NOT_FILE_5) >> 5 & enemy, (pawns & NOT_FILE_0) >> 7 & enemy
+            else:
+                single = pawns << 6 & empty
+                double = (single & unmoved << 6) << 6 & empty
+                captures = (pawns & NOT_FILE_5) << 7 & enemy, (pawns & NOT_FILE_0) << 5 & enemy
+            count += single.bit_count() + double.bit_count()
+            count += captures[0].bit_count() + captures[1].bit_count()
+        not_own = ~own
+        for piece_type, attacks in LEAPER_ATTACKS.items():
+            group = pieces[piece_type]
+            while group:
+                low = group & -group
+                group ^= low
+                count += (attacks[low.bit_length() - 1] & not_own).bit_count()
+        for piece_type in SLIDER_RAY_MASKS:
+            group = pieces[piece_type]
+            while group:
+                low = group & -group
+                group ^= low
+                count += self.count_piece_moves(low.bit_length() - 1)
+        return count
+
+    def get_move_counts(self, color):
+        # number of moves per piece notation, e.g. {"Q": 7, " ": 8, ...}
+        output = dict.fromkeys(NOTATION, 0)
+        own = self.occupied[COLOR_INDEX[color]]
+        while own:
+            low = own & -own
+            own ^= low
+            square = low.bit_length() - 1
+            output[NOTATION[self.mailbox[square] & 7]] += self.count_piece_moves(square)
+        return output
+
+    def attackers_to(self, square, color, occupied=None):
+        # Mask of color's pieces that could capture on square. With occupied given,
+        # only those pieces count and sliders see through everything else (for SEE).
+        pieces = self.pieces[color]
+        if occupied is None:
+            occupied = self.occupied[WHITE] | self.occupied[BLACK]
+        attackers = (
+            PAWN_ATTACKS[color ^ 1][square] & pieces[PAWN]
+            | KNIGHT_ATTACKS[square] & pieces[KNIGHT]
+            | KING_ATTACKS[square] & pieces[KING]
+            | STAR_ATTACKS[square] & pieces[STAR]
+            | JOKER_ATTACKS[square] & pieces[JOKER]
+        )
+        for sliders, ray_masks in (
+            (pieces[ROOK] | pieces[QUEEN], ROOK_RAY_MASKS),
+            (pieces[BISHOP] | pieces[QUEEN], BISHOP_RAY_MASKS),
+        ):
+            if not sliders & occupied:
+                continue
+            for mask, step in ray_masks[square]:
+                blockers = mask & occupied
+                if blockers:
+                    if step > 0:
+                        first = blockers & -blockers
+                    else:
+                        first = 1 << blockers.bit_length() - 1
+                    attackers |= first & sliders
+        return attackers & occupied
+
+    def get_attack_map(self, color):
+        # Mask of the squares color attacks, i.e. could capture on were an enemy piece
+        # there. Built from the bitboards once per position and kept until the key changes.
+        color = COLOR_INDEX[color]
+        if self.attack_keys[color] == self.key:
+            return self.attack_maps[color]
+        pieces = self.pieces[color]
+        pawns = pieces[PAWN]
+        if color == WHITE:
+            attacks = (pawns & NOT_FILE_5) >> 5 | (pawns & NOT_FILE_0) >> 7
+        else:
+            attacks = ((pawns & NOT_FILE_5) << 7 | (pawns & NOT_FILE_0) << 5) & BOARD_MASK
+        for piece_type, leaper_attacks in LEAPER_ATTACKS.items():
+            group = pieces[piece_type]
+            while group:
+                low = group & -group
+                group ^= low
+                attacks |= leaper_attacks[low.bit_length() - 1]
+        occupied = self.occupied[WHITE] | self.occupied[BLACK]
+        for piece_type, ray_masks in SLIDER_RAY_MASKS.items():
+            group = pieces[piece_type]
+            while group:
+                low = group & -group
+                group ^= low
+                for mask, step in ray_masks[low.bit_length() - 1]:
+                    blockers = mask & occupied
+                    if not blockers:
+                        attacks |= mask
+                    elif step > 0:
+                        # the ray up to and including its first blocker
+                        attacks |= mask & ((blockers & -blockers) << 1) - 1
+                    else:
+                        attacks |= mask & ~((1 << blockers.bit_length() - 1) - 1)
+        self.attack_keys[color] = self.key
+        self.attack_maps[color] = attacks
+        return attacks
+
+    def is_attacked(self, square, by_color):
+        return bool(self.get_attack_map(by_color) >> square & 1)
+
+    def see(self, move):
+        # Static exchange evaluation of an encoded capture, in PIECE_VALUES: what the
+        # side making it wins if both sides then keep recapturing on the target square
+        # with their least valuable piece, each free to stop when that is better.
+        start, end = divmod(move & SQUARES_MASK, 36)
+        code = self.mailbox[start]
+        color = code >> 3
+        victim = self.mailbox[end]
+        captured = victim & 7 if victim != EMPTY else EMPTY
+        gains = [PIECE_VALUES[captured] if victim != EMPTY else 0]
+        if code & 7 == PAWN and PROMOTION_MASK[color] >> end & 1:
+            gains[0] += PIECE_VALUES[JOKER] - PIECE_VALUES[PAWN]
+            on_square = JOKER
+        else:
+            on_square = code & 7
+        occupied = (self.occupied[WHITE] | self.occupied[BLACK]) & ~(1 << start)
+        side = color ^ 1
+        # once a king is taken the game is over, so nothing recaptures it
+        while captured != KING:
+            attackers = self.attackers_to(end, side, occupied)
+            if not attackers:
+                break
+            pieces = self.pieces[side]
+            for piece_type in ATTACKER_ORDER:
+                group = attackers & pieces[piece_type]
+                if group:
+                    break
+            captured = on_square
+            gain = PIECE_VALUES[on_square]
+            if piece_type == PAWN and PROMOTION_MASK[side] >> end & 1:
+                gain += PIECE_VALUES[JOKER] - PIECE_VALUES[PAWN]
+                on_square = JOKER
+            else:
+                on_square = piece_type
+            gains.append(gain)
+            occupied ^= group & -group
+            side ^= 1
+        # walk back: each recapture is only made if it comes out ahead
+        result = 0
+        for gain in reversed(gains[1:]):
+            result = max(0, gain - result)
+        return gains[0] - result
+
+    def is_losing_capture(self, move):
+        # see(move) < 0, without playing out the exchange when the victim is worth at
+        # least as much as the piece taking it
+        start, end = divmod(move & SQUARES_MASK, 36)
+        if PIECE_VALUES[self.mailbox[end] & 7] >= PIECE_VALUES[self.mailbox[start] & 7]:
+            return False
+        return self.see(move) < 0
+
+    def iter_captures_of(self, square, color):
+        # encoded captures of the piece on square by color, least valuable attacker first
+        attackers = self.attackers_to(square, color)
+        if not attackers:
+            return
+        pieces = self.pieces[color]
+        promotion = PROMOTION_FLAG if PROMOTION_MASK[color] >> square & 1 else 0
+        for piece_type in ATTACKER_ORDER:
+            group = attackers & pieces[piece_type]
+            while group:
+                low = group & -group
+                group ^= low
+                move = (low.bit_length() - 1) * 36 + square
+                yield move | promotion if piece_type == PAWN else move
+
+    def iter_moves(self, color):
+        # Staged, lazy move generation for search: king captures, then other captures
+        # with the most valuable victims first, then quiet moves. Each stage is only
+        # generated when the caller asks for more moves, so a cutoff after a capture
+        # never pays for the quiet moves. Yields encoded moves (see moves.py).
+        yield from self.iter_captures(color)
+        yield from self.iter_quiet_moves(color)
+
+    def iter_captures(self, color):
+        # the capture stages of iter_moves
+        color = COLOR_INDEX[color]
+        enemy = self.pieces[color ^ 1]
+        king = enemy[KING]
+        while king:
+            low = king & -king
+            king ^= low
+            yield from self.iter_captures_of(low.bit_length() - 1, color)
+        for piece_type in VICTIM_ORDER:
+            victims = enemy[piece_type]
+            while victims:
+                low = victims & -victims
+                victims ^= low
+                yield from self.iter_captures_of(low.bit_length() - 1, color)
+
+    def iter_quiet_moves(self, color):
+        # the non-capturing moves of iter_moves, in board order
+        color = COLOR_INDEX[color]
+        enemy_occupied = self.occupied[color ^ 1]
+        own = self.occupied[color]
+        pawns = self.pieces[color][PAWN]
+        promotion = PROMOTION_MASK[color]
+        while own:
+            low = own & -own
+            own ^= low
+            start = low.bit_length() - 1
+            base = start * 36
+            for target in self.get_piece_targets(start):
+                if not enemy_occupied >> target & 1:
+                    if pawns & low and promotion >> target & 1:
+                        yield base + target | PROMOTION_FLAG
+                    else:
+                        yield base + target
+
+    def is_valid_move(self, move, color):
+        # whether an encoded move (from a hash table or killer slot) can be played by color here
+        squares = move & SQUARES_MASK
+        if squares >= 36 * 36:
+            return False
+        start, end = divmod(squares, 36)
+        code = self.mailbox[start]
+        if code == EMPTY or code >> 3 != COLOR_INDEX[color]:
+            return False
+        return end in self.get_piece_targets(start)
+
+    def is_king_attacked(self, color):
+        # whether color's king could be captured if it were the other side's move
+        color = COLOR_INDEX[color]
+        king = self.pieces[color][KING]
+        return bool(king) and bool(self.attackers_to(king.bit_length() - 1, color ^ 1))
+
+    def has_non_pawn_material(self, color):
+        color = COLOR_INDEX[color]
+        pieces = self.pieces[color]
+        return bool(self.occupied[color] & ~(pieces[PAWN] | pieces[KING]))
+
+    def is_capture(self, move):
+        return self.mailbox[(move & SQUARES_MASK) % 36] != EMPTY
+
+    def get_all_valid_moves(self, color):
+        output = []
+        own = self.occupied[COLOR_INDEX[color]]
+        while own:
+            low = own & -own
+            own ^= low
+            start = low.bit_length() - 1
+            base = start * 36
+            for target in self.get_piece_targets(start):
+                output.append(MOVE_TUPLES[base + target])
+        return output
+
+    def get_move_array(self, color):
+        # the same moves as get_all_valid_moves, encoded as in moves.py
+        output = array("H")
+        color = COLOR_INDEX[color]
+        own = self.occupied[color]
+        pawns = self.pieces[color][PAWN]
+        promotion = PROMOTION_MASK[color]
+        while own:
+            low = own & -own
+            own ^= low
+            start = low.bit_length() - 1
+            base = start * 36
+            if pawns & low:
+                for target in self.get_piece_targets(start):
+                    output.append(base + target | (PROMOTION_FLAG if promotion >> target & 1 else 0))
+            else:
+                for target in self.get_piece_targets(start):
+                    output.append(base + target)
+        return output
+
+    def encode_move(self, start, end):
+        # sets the promotion flag if the piece on start is a pawn reaching the last rank
+        code = self.mailbox[start]
+        if code & 7 == PAWN and PROMOTION_MASK[code >> 3] >> end & 1:
+            return start * 36 + end | PROMOTION_FLAG
+        return start * 36 + end
+
+    def get_piece_counts(self, color):
+        pieces = self.pieces[COLOR_INDEX[color]]
+        return {NOTATION[piece_type]: pieces[piece_type].bit_count() for piece_type in range(8)}
+
+    def get_board_state(self):
+        output = [["" for _ in range(6)] for _ in range(6)]
+        for square, code in enumerate(self.mailbox):
+            if code != EMPTY:
+                output[square // 6][square % 6] = "wb"[code >> 3] + NOTATION[code & 7]
+        return output
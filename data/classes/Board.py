@@ -1,4 +1,6 @@
 from data.classes.Square import Square
+from data.classes.BitBoard import BitBoard
+from data.classes.moves import SQUARES_MASK
 from data.classes.pieces.Rook import Rook
 from data.classes.pieces.Bishop import Bishop
 from data.classes.pieces.Knight import Knight
@@ -27,7 +29,27 @@ class Board:
         self.squares = self.generate_squares()
         self.last_captured = 0
         self.num_moves = 0
+        # undo records for push/pop
+        self.move_stack = []
         self.setup_board()
+        # pieces still on the board per color, and each side's king (None once captured)
+        self.pieces = {"white": [], "black": []}
+        self.kings = {"white": None, "black": None}
+        for square in self.squares:
+            if square.occupying_piece is not None:
+                self.add_piece(square.occupying_piece)
+        # bitboard copy of the position, kept in step by Piece.move
+        self.bitboard = BitBoard.from_board(self)
+        # bumped on every change to the position; derived views cached in view_cache
+        # as key -> (generation, value) stay valid until it moves on
+        self.generation = 0
+        self.view_cache = {}
+
+    # 64-bit Zobrist key of the position (pieces, squares, side to move, unmoved pawns),
+    # updated incrementally on every move; equal positions have equal keys
+    @property
+    def zobrist_key(self):
+        return self.bitboard.key
 
     def generate_squares(self):
         output = []
@@ -36,10 +58,11 @@ class Board:
                 output.append(Square(x, y, self.tile_width, self.tile_height))
         return output
 
+    # squares are stored row by row, so (x, y) is squares[y * 6 + x]
     def get_square_from_pos(self, pos):
-        for square in self.squares:
-            if (square.x, square.y) == (pos[0], pos[1]):
-                return square
+        x, y = pos
+        if 0 <= x < 6 and 0 <= y < 6:
+            return self.squares[y * 6 + x]
 
     def get_piece_from_pos(self, pos):
         return self.get_square_from_pos(pos).occupying_piece
@@ -81,14 +104,26 @@ class Board:
                         )
 
 
+    # keep self.pieces and self.kings current when a piece leaves or returns to the board
+    def add_piece(self, piece):
+        self.pieces[piece.color].append(piece)
+        if piece.notation == "K":
+            self.kings[piece.color] = piece
+
+    def remove_piece(self, piece):
+        self.pieces[piece.color].remove(piece)
+        if piece.notation == "K":
+            self.kings[piece.color] = None
+
+    def get_pieces(self, color):
+        return self.pieces[color]
+
+    def get_king_pos(self, color):
+        king = self.kings[color]
+        return king.pos if king is not None else None
+
     def is_in_checkmate(self, color):
-        output = False
-        pieces_left = [
-            i.occupying_piece.color + i.occupying_piece.notation
-            for i in self.squares
-            if i.occupying_piece is not None
-        ]
-        return color + "K" not in pieces_left
+        return self.kings[color] is None
 
     def is_in_check(self, color):
         return False
@@ -111,15 +146,17 @@ class Board:
             if clicked_square.occupying_piece.color == self.turn:
                 self.selected_piece = clicked_square.occupying_piece
 
+    # drawing lives in data/classes/render.py so the rules stay importable without pygame
     def draw(self, display):
-        if self.selected_piece is not None:
-            self.get_square_from_pos(self.selected_piece.pos).highlight = True
-            for square in self.selected_piece.get_valid_moves(self):
-                square.highlight = True
-        for square in self.squares:
-            square.draw(display)
+        from data.classes.render import draw_board
+        draw_board(display, self)
 
+    # The views below are cached until the next move and shared between callers,
+    # so copy them before modifying.
     def get_board_state(self):
+        cached = self.view_cache.get("state")
+        if cached is not None and cached[0] == self.generation:
+            return cached[1]
         # 2d 6x6 array
         output = [["" for _ in range(6)] for _ in range(6)]
 
@@ -130,6 +167,7 @@ class Board:
                 )
             else:
                 output[square.y][square.x] = ""
+        self.view_cache["state"] = (self.generation, output)
         return output
 
     def handle_move(self, start_pos, end_pos):
@@ -148,18 +186,135 @@ class Board:
             self.num_moves += 1
             return True
 
+    # Make/unmake for search: push applies a move from get_all_valid_moves (or an
+    # encoded move from get_move_array) in place, with no validation or printing,
+    # and pop reverts the last pushed move exactly.
+    # Do not mix with handle_move/handle_click while moves are pushed.
+    def push(self, move):
+        if move.__class__ is int:
+            squares = move & SQUARES_MASK
+            start_square = self.squares[squares // 36]
+            end_square = self.squares[squares % 36]
+        else:
+            start_square = self.get_square_from_pos(move[0])
+            end_square = self.get_square_from_pos(move[1])
+        piece = start_square.occupying_piece
+        captured = end_square.occupying_piece
+        self.move_stack.append(
+            (piece, start_square, end_square, captured, piece.has_moved, piece.notation, self.last_captured)
+        )
+        self.bitboard.push(start_square.index, end_square.index)
+        self.generation += 1
+        if captured is not None:
+            self.remove_piece(captured)
+
+        start_square.occupying_piece = None
+        end_square.occupying_piece = piece
+        piece.pos, piece.x, piece.y = end_square.pos, end_square.x, end_square.y
+        if piece.notation == " " and end_square.y == (0 if piece.color == "white" else 5):
+            piece.promote(piece.color, self)
+        piece.has_moved = True
+        if captured is not None:
+            self.last_captured = 0
+        else:
+            self.last_captured += 1
+        self.num_moves += 1
+        self.turn = "white" if self.turn == "black" else "black"
+
+    # pass the turn without moving, for null-move pruning; pop() undoes it like a move
+    def push_null(self):
+        self.move_stack.append(None)
+        self.bitboard.push_null()
+        self.turn = "white" if self.turn == "black" else "black"
+
+    def pop(self):
+        if self.move_stack[-1] is None:
+            self.move_stack.pop()
+            self.bitboard.pop()
+            self.turn = "white" if self.turn == "black" else "black"
+            return
+        piece, start_square, end_square, captured, has_moved, notation, last_captured = self.move_stack.pop()
+        self.bitboard.pop()
+        self.generation += 1
+
+        if piece.notation != notation:
+            piece.demote(self)
+        end_square.occupying_piece = captured
+        if captured is not None:
+            self.add_piece(captured)
+        start_square.occupying_piece = piece
+        piece.pos, piece.x, piece.y = start_square.pos, start_square.x, start_square.y
+        piece.has_moved = has_moved
+        self.last_captured = last_captured
+        self.num_moves -= 1
+        self.turn = "white" if self.turn == "black" else "black"
+
     def alg_not_to_pos(self, alg_not):
         return (ord(alg_not[0]) - 65, int(alg_not[1]) - 1)
 
+    # cached and shared like get_board_state
     def get_all_valid_moves(self, color):
-        output = []
-        for square in self.squares:
-            if (
-                square.occupying_piece is not None
-                and square.occupying_piece.color == color
-            ):
-                for move in square.occupying_piece.get_valid_moves(self):
-                    output.append((square.pos, move.pos))
+        cached = self.view_cache.get(color)
+        if cached is not None and cached[0] == self.generation:
+            return cached[1]
+        output = self.bitboard.get_all_valid_moves(color)
+        self.view_cache[color] = (self.generation, output)
+        return output
+
+    # get_all_valid_moves as an array('H') of encoded moves (see data/classes/moves.py)
+    def get_move_array(self, color):
+        key = ("array", color)
+        cached = self.view_cache.get(key)
+        if cached is not None and cached[0] == self.generation:
+            return cached[1]
+        output = self.bitboard.get_move_array(color)
+        self.view_cache[key] = (self.generation, output)
         return output
+
+    # generator over color's moves as encoded ints: king captures, then other captures
+    # (most valuable victim first), then quiet moves, each stage built only when reached;
+    # pushing and popping moves between steps is fine
+    def iter_moves(self, color):
+        return self.bitboard.iter_moves(color)
+
+    # ((x, y), (x, y)) -> encoded move, with the promotion flag set when it applies
+    def encode_move(self, move):
+        (start_x, start_y), (end_x, end_y) = move
+        return self.bitboard.encode_move(start_y * 6 + start_x, end_y * 6 + end_x)
+
+    # number of pieces of each notation for color, e.g. {"Q": 1, " ": 6, ...}
+    def get_piece_counts(self, color):
+        key = ("counts", color)
+        cached = self.view_cache.get(key)
+        if cached is not None and cached[0] == self.generation:
+            return cached[1]
+        output = self.bitboard.get_piece_counts(color)
+        self.view_cache[key] = (self.generation, output)
+        return output
+
+    # len(get_all_valid_moves(color)) without building the list, e.g. for mobility terms
+    def count_moves(self, color):
+        key = ("count", color)
+        cached = self.view_cache.get(key)
+        if cached is not None and cached[0] == self.generation:
+            return cached[1]
+        output = self.bitboard.count_moves(color)
+        self.view_cache[key] = (self.generation, output)
+        return output
+
+    # number of moves for color's pieces of each notation, e.g. {"Q": 7, " ": 8, ...}
+    def get_move_counts(self, color):
+        return self.bitboard.get_move_counts(color)
+
+    # whether by_color could capture on pos, were an enemy piece there
+    def is_attacked(self, pos, by_color):
+        x, y = pos
+        return self.bitboard.is_attacked(y * 6 + x, by_color)
+
+    # static exchange evaluation of the capture ((x, y), (x, y)) in material units,
+    # e.g. 2 for a knight taking a defended rook, -4 for a queen taking a defended rook
+    def see(self, move):
+        return self.bitboard.see(self.encode_move(move))
+
     def is_in_draw(self):
         return self.num_moves >= 100
\ No newline at end of file
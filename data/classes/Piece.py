@@ -7,6 +7,13 @@ class Piece:
         self.has_moved = False
         self.has_promoted = False
         self.notation = None
+    # drawn from the shared sprite cache, so pieces never load images themselves;
+    # imported here so that the rules never pull in pygame unless something renders
+    @property
+    def img(self):
+        from data.classes.sprites import get_sprite
+        return get_sprite(self.sprite_name, self.color, self.sprite_size)
+
     def get_notation(self):
         return self.notation
     def get_moves(self, board):
@@ -34,6 +41,8 @@ class Piece:
             i.highlight = False
         if square in self.get_valid_moves(board) or force:
             prev_square = board.get_square_from_pos(self.pos)
+            board.bitboard.move_piece(prev_square.index, square.index)
+            board.generation += 1
             self.pos, self.x, self.y = square.pos, square.x, square.y
             if(self.get_notation() == ' ' and self.y == 0 and self.color == "white") or (self.get_notation() == ' ' and self.y == 5 and self.color == "black") and not self.has_promoted:
                 self.promote(self.color, board)
@@ -41,6 +50,7 @@ class Piece:
 
             prev_square.occupying_piece = None
             if square.occupying_piece is not None:
+                board.remove_piece(square.occupying_piece)
                 board.last_captured = 0
             else:
                 board.last_captured += 1
@@ -0,0 +1,174 @@
+import math
+import random
+import time
+
+from data.classes.BitBoard import KING, COLOR_INDEX, COLOR_NAMES
+from data.classes.evaluation import build_eval_table
+from data.classes.moves import SQUARES_MASK, move_to_tuple
+from data.classes.search.NodePool import NodePool
+
+SCORES_DICT = {
+    " ": 1,  # pawn
+    "N": 3,  # knight
+    "B": 3,  # bishop
+    "R": 5,  # rook
+    "S": 5,  # star
+    "Q": 9,  # queen
+    "J": 9,  # joker
+    "K": 100  # king
+}
+
+EVAL_TABLE = build_eval_table(SCORES_DICT)
+
+
+class Bot:
+    """
+    Monte Carlo tree search (UCT). Each playout walks down the tree by the UCB1 score,
+    adds the children of the node it stops at once that node has been visited before,
+    then plays rollout_plies random moves (taking the king whenever it can) and scores
+    the position reached with a material count squashed to 0..1. With no random moves
+    at all the playout is just that count at the leaf, which plays better here: a
+    few times more playouts beat the noise of the random moves.
+    Everything runs on board.bitboard with push/pop, so a playout builds no Board
+    or Piece objects, and the tree is a NodePool of flat arrays. On the next move, the
+    part of the tree under the opponent's reply is kept if one of its nodes has the
+    board's Zobrist key; anything else starts a new tree.
+    """
+    def __init__(self):
+        self.time_limit_ms = 80  # deadline for each move, under the 0.1 second limit in rules.md
+        self.exploration = 1.4  # UCB1 constant, for results between 0 and 1
+        self.rollout_plies = 0  # random moves before the material count; 0 scores the leaf itself
+        self.eval_scale = 3  # material lead (in pawns) that scores 1 / (1 + e^-1), about 0.73
+        self.pool = NodePool()
+        self.root = None
+        # the child of root we played
+        self.played = None
+        # playouts and seconds spent for every move, and the tree nodes reused
+        self.playout_history = []
+        self.time_history = []
+        self.reused_history = []
+
+    def move(self, side, board):
+        start = time.perf_counter()
+        deadline = start + self.time_limit_ms / 1000
+        bitboard = board.bitboard
+        color = COLOR_INDEX[side]
+        if not bitboard.pieces[color][KING] or not bitboard.get_move_array(side):
+            # nothing to search: no move, as iterative_deepening gives when no depth completes
+            self.played = None
+            return None
+        root = self.find_root(board)
+        reused = 0
+        if root is None:
+            self.pool.clear()
+            root = self.pool.add_root(0, board.zobrist_key)
+        else:
+            # the rest of the old tree can no longer be reached; drop it so the pool
+            # has its full room for this move
+            reused = self.pool.visits[root]
+            root = self.pool.compact(root)
+        self.root = root
+        playouts = 0
+        while True:
+            self.playout(bitboard, color, root)
+            playouts += 1
+            if time.perf_counter() >= deadline or self.pool.is_full():
+                break
+        child = self.pool.most_visited_child(root)
+        move = self.pool.move[child]
+        self.played = child
+        self.playout_history.append(playouts)
+        self.time_history.append(time.perf_counter() - start)
+        self.reused_history.append(reused)
+        return move_to_tuple(move)
+
+    def find_root(self, board):
+        # the node for the current position under the move we played last time, or None
+        if self.played is None:
+            return None
+        key = board.zobrist_key
+        for child in self.pool.children(self.played):
+            # key is only set on nodes a playout has been through
+            if self.pool.visits[child] and self.pool.key[child] == key:
+                return child
+        return None
+
+    def playout(self, bitboard, color, root):
+        pool = self.pool
+        first_child, child_count = pool.first_child, pool.child_count
+        visits, value, moves, keys = pool.visits, pool.value, pool.move, pool.key
+        exploration = self.exploration
+        node = root
+        path = [root]
+        while True:
+            if not bitboard.pieces[color][KING]:
+                # our king was taken by the move into node
+                result = 0.0
+                break
+            if not child_count[node]:
+                if visits[node] or node == root:
+                    legal = bitboard.get_move_array(COLOR_NAMES[color])
+                    if not legal:
+                        result = 0.5
+                        break
+                    pool.expand(node, legal)
+                else:
+                    result = self.rollout(bitboard, color)
+                    break
+            # UCB1: unvisited children first, then mean result plus the exploration term
+            first = first_child[node]
+            log_visits = math.log(visits[node] + 1)
+            best_score = -1.0
+            for child in range(first, first + child_count[node]):
+                n = visits[child]
+                if not n:
+                    best = child
+                    break
+                score = value[child] / n + exploration * math.sqrt(log_visits / n)
+                if score > best_score:
+                    best_score = score
+                    best = child
+            node = best
+            bitboard.push(*divmod(moves[node] & SQUARES_MASK, 36))
+            if not visits[node]:
+                keys[node] = bitboard.key
+            path.append(node)
+            color ^= 1
+        for _ in range(len(path) - 1):
+            bitboard.pop()
+        # result is for the side to move at the last node; each node scores for the side
+        # that moved into it
+        result = 1.0 - result
+        for node in reversed(path):
+            visits[node] += 1
+            value[node] += result
+            result = 1.0 - result
+
+    def rollout(self, bitboard, color):
+        # result for color, the side to move
+        pieces = bitboard.pieces
+        mover = color
+        plies = 0
+        result = None
+        while True:
+            king = pieces[mover ^ 1][KING]
+            if bitboard.attackers_to(king.bit_length() - 1, mover):
+                # taking the king ends the game
+                result = 1.0 if mover == color else 0.0
+                break
+            if plies == self.rollout_plies:
+                break
+            legal = bitboard.get_move_array(COLOR_NAMES[mover])
+            if not legal:
+                break
+            bitboard.push(*divmod(legal[random.randrange(len(legal))] & SQUARES_MASK, 36))
+            plies += 1
+            mover ^= 1
+        if result is None:
+            score = bitboard.get_eval_score(EVAL_TABLE)
+            if color:
+                score = -score
+            result = 1 / (1 + math.exp(-score / self.eval_scale))
+        for _ in range(plies):
+            bitboard.pop()
+        return result
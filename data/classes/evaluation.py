@@ -0,0 +1,28 @@
+# /* evaluation.py
+# Flattened material + piece-square tables for BitBoard.get_eval_score.
+# Entry (color << 3 | piece type) * 36 + square is what that piece is worth on that
+# square, as an int in 1 / resolution units, positive for white and negative for black.
+# The bitboard keeps the sum over the pieces on the board up to date as they are put
+# and removed, so a bot reads its material and positional score in O(1) at a leaf.
+from data.classes.move_tables import WHITE, BLACK
+from data.classes.BitBoard import NOTATION
+
+
+def build_eval_table(piece_values, square_tables=None, resolution=1, square_weight=1):
+    """
+    piece_values maps piece notation to material, as in the bots' SCORES_DICT.
+    square_tables maps notation to a 6x6 bonus seen from white's side, rows indexed
+    by y; black's rows are mirrored. The bonus is multiplied by square_weight.
+    Every value is multiplied by resolution and rounded, so choose a resolution that
+    makes them whole numbers and divide the score by it again.
+    """
+    table = [0] * (16 * 36)
+    for piece_type, notation in enumerate(NOTATION):
+        for square in range(36):
+            x, y = square % 6, square // 6
+            for color, row, sign in ((WHITE, y, 1), (BLACK, 5 - y, -1)):
+                value = piece_values.get(notation, 0)
+                if square_tables is not None and notation in square_tables:
+                    value += square_weight * square_tables[notation][row][x]
+                table[(color << 3 | piece_type) * 36 + square] = sign * round(value * resolution)
+    return tuple(table)
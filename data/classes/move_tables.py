@@ -0,0 +1,117 @@
+# /* move_tables.py
+# Move tables for the 6x6 board, built once at import.
+# Squares are indexed as y * 6 + x, which is the same order as Board.squares,
+# so bit i of a bitboard is Board.squares[i].
+
+WHITE = 0
+BLACK = 1
+
+POS = tuple((i % 6, i // 6) for i in range(36))
+
+# every (start, end) pair as a ready-made ((x, y), (x, y)) tuple, indexed by start * 36 + end
+MOVE_TUPLES = tuple((POS[start], POS[end]) for start in range(36) for end in range(36))
+
+# offsets and directions are listed in the same order the piece classes use,
+# so the generated moves come out in the same order as the object model
+KNIGHT_OFFSETS = [(1, -2), (2, -1), (2, 1), (1, 2), (-1, 2), (-2, 1), (-2, -1), (-1, -2)]
+KING_OFFSETS = [(0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1)]
+STAR_OFFSETS = [(1, 1), (-1, 1), (1, -1), (-1, -1), (2, 0), (-2, 0), (0, 2), (0, -2)]
+JOKER_OFFSETS = [
+    (1, 1), (-1, 1), (1, -1), (-1, -1), (2, 0), (-2, 0), (0, 2), (0, -2),
+    (1, 0), (-1, 0), (0, 1), (0, -1), (2, 2), (-2, 2), (2, -2), (-2, -2),
+]
+ROOK_DIRECTIONS = [(0, -1), (1, 0), (0, 1), (-1, 0)]  # north, east, south, west
+BISHOP_DIRECTIONS = [(1, -1), (1, 1), (-1, 1), (-1, -1)]  # ne, se, sw, nw
+QUEEN_DIRECTIONS = [
+    (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1)
+]
+
+
+def on_board(x, y):
+    return 0 <= x < 6 and 0 <= y < 6
+
+
+def to_mask(squares):
+    mask = 0
+    for square in squares:
+        mask |= 1 << square
+    return mask
+
+
+def build_targets(offsets):
+    output = []
+    for x, y in POS:
+        output.append(tuple(
+            (y + dy) * 6 + x + dx for dx, dy in offsets if on_board(x + dx, y + dy)
+        ))
+    return tuple(output)
+
+
+def build_rays(directions):
+    output = []
+    for x, y in POS:
+        rays = []
+        for dx, dy in directions:
+            ray = []
+            i = 1
+            while on_board(x + dx * i, y + dy * i):
+                ray.append((y + dy * i) * 6 + x + dx * i)
+                i += 1
+            if ray:
+                rays.append(tuple(ray))
+        output.append(tuple(rays))
+    return tuple(output)
+
+
+KNIGHT_TARGETS = build_targets(KNIGHT_OFFSETS)
+KING_TARGETS = build_targets(KING_OFFSETS)
+STAR_TARGETS = build_targets(STAR_OFFSETS)
+JOKER_TARGETS = build_targets(JOKER_OFFSETS)
+
+KNIGHT_ATTACKS = tuple(to_mask(t) for t in KNIGHT_TARGETS)
+KING_ATTACKS = tuple(to_mask(t) for t in KING_TARGETS)
+STAR_ATTACKS = tuple(to_mask(t) for t in STAR_TARGETS)
+JOKER_ATTACKS = tuple(to_mask(t) for t in JOKER_TARGETS)
+
+ROOK_RAYS = build_rays(ROOK_DIRECTIONS)
+BISHOP_RAYS = build_rays(BISHOP_DIRECTIONS)
+QUEEN_RAYS = build_rays(QUEEN_DIRECTIONS)
+
+
+def build_ray_masks(rays):
+    # per square, (mask of the ray, step between its squares) for each ray from build_rays;
+    # the first blocker on a ray is its lowest set bit for a positive step, highest otherwise
+    return tuple(
+        tuple((to_mask(ray), ray[0] - square) for ray in square_rays)
+        for square, square_rays in enumerate(rays)
+    )
+
+
+ROOK_RAY_MASKS = build_ray_masks(ROOK_RAYS)
+BISHOP_RAY_MASKS = build_ray_masks(BISHOP_RAYS)
+QUEEN_RAY_MASKS = build_ray_masks(QUEEN_RAYS)
+
+# pawns push one square (or two before their first move) and capture diagonally forward;
+# indexed [color][square]
+PAWN_DIRECTION = (-1, 1)
+PAWN_SINGLE_PUSHES = tuple(
+    build_targets([(0, PAWN_DIRECTION[color])]) for color in (WHITE, BLACK)
+)
+PAWN_PUSHES = tuple(
+    build_targets([(0, PAWN_DIRECTION[color]), (0, 2 * PAWN_DIRECTION[color])])
+    for color in (WHITE, BLACK)
+)
+PAWN_CAPTURES = tuple(
+    build_targets([(1, PAWN_DIRECTION[color]), (-1, PAWN_DIRECTION[color])])
+    for color in (WHITE, BLACK)
+)
+PAWN_ATTACKS = tuple(tuple(to_mask(t) for t in table) for table in PAWN_CAPTURES)
+
+# whole-board pawn steps by shifting: forward is -6 for white and +6 for black,
+# and the diagonal steps need the pawn off the edge file they would wrap around
+BOARD_MASK = (1 << 36) - 1
+NOT_FILE_0 = to_mask(square for square in range(36) if square % 6 != 0)
+NOT_FILE_5 = to_mask(square for square in range(36) if square % 6 != 5)
+
+# a pawn that lands on this rank becomes a Joker
+PROMOTION_MASK = (to_mask(range(0, 6)), to_mask(range(30, 36)))
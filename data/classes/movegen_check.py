@@ -0,0 +1,101 @@
+# /* movegen_check.py
+# Regression check of the bitboard move generation against the piece move rules
+# (Piece.get_valid_moves on the Square/Piece objects), over random games:
+#   python -m data.classes.movegen_check --games 200 --seed 1
+# At every position, for both colors, the moves from BitBoard (tuples, encoded arrays,
+# iter_moves, counts) must be exactly the moves the pieces themselves give, and the
+# bitboard must hold the same pieces as the squares. Prints each mismatch and exits
+# with status 1 if there was any.
+import argparse
+import random
+import sys
+from collections import Counter
+
+from data.classes.Board import Board
+from data.classes.moves import SQUARES_MASK, move_to_tuple
+
+
+def piece_moves(board, color):
+    # color's moves from the piece objects, as ((x, y), (x, y)) tuples
+    output = []
+    for piece in board.get_pieces(color):
+        for square in piece.get_valid_moves(board):
+            output.append((piece.pos, square.pos))
+    return output
+
+
+def compare_moves(board, color):
+    # a description of every way the bitboard moves differ from the piece moves
+    errors = []
+    expected = sorted(piece_moves(board, color))
+    bitboard = board.bitboard
+    moves = sorted(bitboard.get_all_valid_moves(color))
+    if moves != expected:
+        errors.append(
+            f"{color} get_all_valid_moves: missing {sorted(set(expected) - set(moves))}, "
+            f"extra {sorted(set(moves) - set(expected))}"
+        )
+    array = bitboard.get_move_array(color)
+    if sorted(move_to_tuple(move) for move in array) != expected:
+        errors.append(f"{color} get_move_array differs")
+    for move in array:
+        start, end = divmod(move & SQUARES_MASK, 36)
+        if move != bitboard.encode_move(start, end):
+            errors.append(f"{color} get_move_array promotion flag wrong on {move_to_tuple(move)}")
+        if not bitboard.is_valid_move(move, color):
+            errors.append(f"{color} is_valid_move rejects {move_to_tuple(move)}")
+    if sorted(move_to_tuple(move) for move in bitboard.iter_moves(color)) != expected:
+        errors.append(f"{color} iter_moves differs")
+    if bitboard.count_moves(color) != len(expected):
+        errors.append(f"{color} count_moves {bitboard.count_moves(color)}, expected {len(expected)}")
+    counts = Counter(board.get_piece_from_pos(start).notation for start, _ in expected)
+    move_counts = {notation: count for notation, count in bitboard.get_move_counts(color).items() if count}
+    if move_counts != dict(counts):
+        errors.append(f"{color} get_move_counts {move_counts}, expected {dict(counts)}")
+    return errors
+
+
+def compare_position(board):
+    errors = []
+    if board.bitboard.get_board_state() != board.get_board_state():
+        errors.append("bitboard pieces differ from the squares")
+    for color in ("white", "black"):
+        errors.extend(compare_moves(board, color))
+    return errors
+
+
+def run_check(games, seed, max_plies=120):
+    # (positions checked, mismatches as (game, ply, description))
+    rng = random.Random(seed)
+    positions = 0
+    mismatches = []
+    for game in range(games):
+        board = Board(600, 600)
+        for ply in range(max_plies):
+            positions += 1
+            for error in compare_position(board):
+                mismatches.append((game, ply, error))
+            moves = board.get_all_valid_moves(board.turn)
+            if not moves or board.is_in_checkmate("white") or board.is_in_checkmate("black"):
+                break
+            # captures more often than not, so games reach promotions and sparse boards
+            captures = [move for move in moves if board.get_piece_from_pos(move[1]) is not None]
+            if captures and rng.random() < 0.6:
+                board.push(rng.choice(captures))
+            else:
+                board.push(rng.choice(moves))
+    return positions, mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-plies", type=int, default=120)
+    args = parser.parse_args()
+
+    positions, mismatches = run_check(args.games, args.seed, args.max_plies)
+    for game, ply, error in mismatches:
+        print(f"game {game} ply {ply}: {error}")
+    print(f"{positions} positions from {args.games} games, {len(mismatches)} mismatches")
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,42 @@
+# /* moves.py
+# Compact moves: start * 36 + end in the low 11 bits, with PROMOTION_FLAG
+# set when a pawn reaches the last rank and becomes a Joker. Encoded moves fit in
+# an unsigned 16-bit array('H'), so move lists, killer/history tables and hash
+# entries can hold them without building ((x, y), (x, y)) tuples.
+from data.classes.move_tables import MOVE_TUPLES
+
+SQUARES_MASK = (1 << 11) - 1
+PROMOTION_FLAG = 1 << 11
+NO_MOVE = 0xFFFF
+
+
+def encode_move(start, end, promotion=False):
+    return start * 36 + end | (PROMOTION_FLAG if promotion else 0)
+
+
+def decode_move(move):
+    # (start square, end square, promotion) with squares indexed y * 6 + x
+    squares = move & SQUARES_MASK
+    return squares // 36, squares % 36, bool(move & PROMOTION_FLAG)
+
+
+def move_start(move):
+    return (move & SQUARES_MASK) // 36
+
+
+def move_end(move):
+    return (move & SQUARES_MASK) % 36
+
+
+def is_promotion(move):
+    return bool(move & PROMOTION_FLAG)
+
+
+def move_to_tuple(move):
+    # shared, preallocated ((x, y), (x, y)) tuple, as returned by Board.get_all_valid_moves
+    return MOVE_TUPLES[move & SQUARES_MASK]
+
+
+def tuple_to_move(move, promotion=False):
+    (start_x, start_y), (end_x, end_y) = move
+    return encode_move(start_y * 6 + start_x, end_y * 6 + end_x, promotion)
@@ -1,41 +1,18 @@
 # /* King.py
 
-import pygame
 from data.classes.Piece import Piece
+from data.classes.move_tables import KING_TARGETS
 
 
 class King(Piece):
     def __init__(self, pos, color, board):
         super().__init__(pos, color, board)
-        img_path = "data/imgs/" + color[0] + "_king.png"
-        self.img = pygame.image.load(img_path)
-        self.img = pygame.transform.scale(
-            self.img, (board.tile_width - 20, board.tile_height - 20)
-        )
+        self.sprite_name = "king"
+        self.sprite_size = (board.tile_width - 20, board.tile_height - 20)
         self.notation = "K"
 
     def get_possible_moves(self, board):
-        output = []
-        moves = [
-            (0, -1),  # north
-            (1, -1),  # ne
-            (1, 0),  # east
-            (1, 1),  # se
-            (0, 1),  # south
-            (-1, 1),  # sw
-            (-1, 0),  # west
-            (-1, -1),  # nw
-        ]
-        for move in moves:
-            new_pos = (self.x + move[0], self.y + move[1])
-            if (
-                new_pos[0] < 6
-                and new_pos[0] >= 0
-                and new_pos[1] < 6
-                and new_pos[1] >= 0
-            ):
-                output.append([board.get_square_from_pos(new_pos)])
-        return output
+        return [[board.squares[i]] for i in KING_TARGETS[self.y * 6 + self.x]]
 
     def can_castle(self, board):
         # if not self.has_moved:
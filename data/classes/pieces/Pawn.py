@@ -1,61 +1,51 @@
-import pygame
-
 from data.classes.Piece import Piece
+from data.classes.move_tables import (
+    WHITE,
+    BLACK,
+    JOKER_TARGETS,
+    PAWN_SINGLE_PUSHES,
+    PAWN_PUSHES,
+    PAWN_CAPTURES,
+)
 
 class Pawn(Piece):
     def __init__(self, pos, color, board):
         super().__init__(pos, color, board)
         self.promoted = False
-        img_path = "data/imgs/" + color[0] + "_pawn.png"
-        self.img = pygame.image.load(img_path)
-        self.img = pygame.transform.scale(
-            self.img, (board.tile_width - 35, board.tile_height - 35)
-        )
+        self.sprite_name = "pawn"
+        self.sprite_size = (board.tile_width - 35, board.tile_height - 35)
         self.notation = " "
     def promote(self, color, board):
         self.promoted = True
-        self.img = pygame.image.load("data/imgs/" + color[0] + "_joker.png")
-        self.img = pygame.transform.scale(
-            self.img, (board.tile_width + 60, board.tile_height - 5)
-        )
+        self.sprite_name = "joker"
+        self.sprite_size = (board.tile_width + 60, board.tile_height - 5)
         self.notation = "J"
 
+    # undo promote, used by Board.pop
+    def demote(self, board):
+        self.promoted = False
+        self.sprite_name = "pawn"
+        self.sprite_size = (board.tile_width - 35, board.tile_height - 35)
+        self.notation = " "
+
     def get_possible_moves(self, board):
-        output = []
-        moves = []
-        # move forward
-        if self.color == "white":
-            moves.append((0, -1))
-            if not self.has_moved:
-                moves.append((0, -2))
-        elif self.color == "black":
-            moves.append((0, 1))
-            if not self.has_moved:
-                moves.append((0, 2))
-        for move in moves:
-            new_pos = (self.x, self.y + move[1])
-            if new_pos[1] < 6 and new_pos[1] >= 0:
-                output.append(board.get_square_from_pos(new_pos))
-        return output
+        color = WHITE if self.color == "white" else BLACK
+        square = self.y * 6 + self.x
+        if self.has_moved:
+            pushes = PAWN_SINGLE_PUSHES[color][square]
+        else:
+            pushes = PAWN_PUSHES[color][square]
+        return [board.squares[i] for i in pushes]
 
     def get_moves(self, board):
         output = []
 
         if self.promoted == True:
             #print("This is joker moveset")
-            output = []
-            moves = [(1, 1), (-1, 1), (1, -1), (-1, -1), (2, 0), (-2, 0), (0, 2), (0, -2), (1, 0), (-1, 0), (0, 1), (0, -1), (2, 2), (-2, 2), (2, -2), (-2, -2)]
-            for move in moves:
-                new_pos = (self.x + move[0], self.y + move[1])
-                if (
-                    new_pos[0] < 6
-                    and new_pos[0] >= 0
-                    and new_pos[1] < 6
-                    and new_pos[1] >= 0
-                ):
-                    square = board.get_square_from_pos(new_pos)
-                    if square.occupying_piece == None or square.occupying_piece.color != self.color:
-                        output.append(square)
+            for i in JOKER_TARGETS[self.y * 6 + self.x]:
+                square = board.squares[i]
+                if square.occupying_piece == None or square.occupying_piece.color != self.color:
+                    output.append(square)
             return output
 
 
@@ -64,28 +54,12 @@ class Pawn(Piece):
                 break
             else:
                 output.append(square)
-        if self.color == "white":
-            if self.x + 1 < 6 and self.y - 1 >= 0:
-                square = board.get_square_from_pos((self.x + 1, self.y - 1))
-                if square.occupying_piece != None:
-                    if square.occupying_piece.color != self.color:
-                        output.append(square)
-            if self.x - 1 >= 0 and self.y - 1 >= 0:
-                square = board.get_square_from_pos((self.x - 1, self.y - 1))
-                if square.occupying_piece != None:
-                    if square.occupying_piece.color != self.color:
-                        output.append(square)
-        elif self.color == "black":
-            if self.x + 1 < 6 and self.y + 1 < 6:
-                square = board.get_square_from_pos((self.x + 1, self.y + 1))
-                if square.occupying_piece != None:
-                    if square.occupying_piece.color != self.color:
-                        output.append(square)
-            if self.x - 1 >= 0 and self.y + 1 < 6:
-                square = board.get_square_from_pos((self.x - 1, self.y + 1))
-                if square.occupying_piece != None:
-                    if square.occupying_piece.color != self.color:
-                        output.append(square)
+        color = WHITE if self.color == "white" else BLACK
+        for i in PAWN_CAPTURES[color][self.y * 6 + self.x]:
+            square = board.squares[i]
+            if square.occupying_piece != None:
+                if square.occupying_piece.color != self.color:
+                    output.append(square)
         return output
 
     def attacking_squares(self, board):
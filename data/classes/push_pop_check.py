@@ -0,0 +1,129 @@
+# /* push_pop_check.py
+# Regression check that Board.push/push_null and pop leave no trace, over random games:
+#   python -m data.classes.push_pop_check --games 100 --seed 1
+# From every position of a random game, a random line of up to --depth moves (with
+# the odd null move) is pushed and popped again; afterwards the Board, its pieces and
+# squares, and the BitBoard must be exactly as before. After every push the
+# incremental Zobrist key and evaluation sum must also match a full recomputation,
+# and the bitboard the squares. Prints each mismatch and exits with status 1 if
+# there was any.
+import argparse
+import random
+import sys
+
+from data.classes.BitBoard import COLOR_INDEX, EMPTY
+from data.classes.Board import Board
+
+
+def snapshot(board):
+    # everything push and pop touch, copied so later moves cannot change it
+    bitboard = board.bitboard
+    return {
+        "board state": [row[:] for row in board.get_board_state()],
+        "zobrist key": board.zobrist_key,
+        "turn": board.turn,
+        "num_moves": board.num_moves,
+        "last_captured": board.last_captured,
+        "move_stack": len(board.move_stack),
+        "pieces": {color: sorted(map(id, pieces)) for color, pieces in board.pieces.items()},
+        "kings": {color: id(king) for color, king in board.kings.items()},
+        "squares": [id(square.occupying_piece) for square in board.squares],
+        "piece fields": sorted(
+            (id(piece), piece.pos, piece.x, piece.y, piece.has_moved, piece.notation,
+             getattr(piece, "promoted", None), piece.sprite_name, piece.sprite_size)
+            for pieces in board.pieces.values() for piece in pieces
+        ),
+        "bitboard pieces": [row[:] for row in bitboard.pieces],
+        "bitboard occupied": bitboard.occupied[:],
+        "bitboard mailbox": bitboard.mailbox[:],
+        "bitboard unmoved": bitboard.unmoved,
+        "bitboard turn": bitboard.turn,
+        "bitboard key": bitboard.key,
+        "bitboard history": len(bitboard.history),
+        "eval scores": bitboard.eval_scores[:],
+    }
+
+
+def compare_snapshots(before, after):
+    return [f"{name} not restored" for name in before if before[name] != after[name]]
+
+
+def check_incremental(board, table):
+    # the state kept up to date move by move, against the same state built from scratch
+    errors = []
+    bitboard = board.bitboard
+    if bitboard.key != bitboard.compute_key():
+        errors.append("incremental Zobrist key differs from compute_key")
+    score = sum(table[code * 36 + square] for square, code in enumerate(bitboard.mailbox) if code != EMPTY)
+    if bitboard.get_eval_score(table) != score:
+        errors.append("incremental evaluation differs from a full sum")
+    if bitboard.get_board_state() != board.get_board_state():
+        errors.append("bitboard pieces differ from the squares")
+    if bitboard.turn != COLOR_INDEX[board.turn]:
+        errors.append("bitboard turn differs from the board's")
+    return errors
+
+
+def push_random_line(board, rng, depth, table, errors):
+    # pushes up to depth moves, checking after each one; returns how many were pushed
+    pushed = 0
+    for _ in range(depth):
+        if board.is_in_checkmate("white") or board.is_in_checkmate("black"):
+            break
+        moves = board.get_all_valid_moves(board.turn)
+        if not moves:
+            break
+        if rng.random() < 0.1:
+            board.push_null()
+        elif rng.random() < 0.5:
+            board.push(rng.choice(moves))
+        else:
+            # encoded moves go through the other branch of Board.push
+            move_array = board.get_move_array(board.turn)
+            board.push(move_array[rng.randrange(len(move_array))])
+        pushed += 1
+        errors.extend(check_incremental(board, table))
+    return pushed
+
+
+def run_check(games, seed, depth=4, max_plies=120):
+    # (lines pushed and popped, mismatches as (game, ply, description))
+    rng = random.Random(seed)
+    # arbitrary values for every piece on every square, so a wrong update shows up
+    table = tuple(rng.randrange(-100, 100) for _ in range(16 * 36))
+    lines = 0
+    mismatches = []
+    for game in range(games):
+        board = Board(600, 600)
+        board.bitboard.get_eval_score(table)
+        for ply in range(max_plies):
+            errors = []
+            before = snapshot(board)
+            pushed = push_random_line(board, rng, rng.randrange(1, depth + 1), table, errors)
+            for _ in range(pushed):
+                board.pop()
+            errors.extend(compare_snapshots(before, snapshot(board)))
+            errors.extend(check_incremental(board, table))
+            lines += 1
+            for error in errors:
+                mismatches.append((game, ply, error))
+            moves = board.get_all_valid_moves(board.turn)
+            if not moves or board.is_in_checkmate("white") or board.is_in_checkmate("black"):
+                break
+            board.push(rng.choice(moves))
+    return lines, mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--max-plies", type=int, default=120)
+    args = parser.parse_args()
+
+    lines, mismatches = run_check(args.games, args.seed, args.depth, args.max_plies)
+    for game, ply, error in mismatches:
+        print(f"game {game} ply {ply}: {error}")
+    print(f"{lines} lines pushed and popped in {args.games} games, {len(mismatches)} mismatches")
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,31 @@
+# /* render.py
+# Optional pygame drawing layer. Board, Piece, Square and the pieces never import
+# pygame, so the game rules run headless; only code that draws needs this module.
+import pygame
+
+from data.classes.sprites import get_sprite
+
+
+def draw_square(display, square):
+    rect = pygame.Rect(square.abs_x, square.abs_y, square.width, square.height)
+    # configures if tile should be light or dark or highlighted tile
+    if square.highlight:
+        pygame.draw.rect(display, square.highlight_color, rect)
+    else:
+        pygame.draw.rect(display, square.draw_color, rect)
+    # adds the chess piece icons
+    piece = square.occupying_piece
+    if piece is not None:
+        img = get_sprite(piece.sprite_name, piece.color, piece.sprite_size)
+        centering_rect = img.get_rect()
+        centering_rect.center = rect.center
+        display.blit(img, centering_rect.topleft)
+
+
+def draw_board(display, board):
+    if board.selected_piece is not None:
+        board.get_square_from_pos(board.selected_piece.pos).highlight = True
+        for square in board.selected_piece.get_valid_moves(board):
+            square.highlight = True
+    for square in board.squares:
+        draw_square(display, square)
@@ -0,0 +1,123 @@
+# /* MoveOrderer.py
+from array import array
+
+from data.classes.BitBoard import EMPTY, PIECE_VALUES
+from data.classes.moves import NO_MOVE, SQUARES_MASK
+
+MAX_PLY = 64
+
+# order_moves scores: hash move, then captures, then killers, then history, then losing captures
+HASH_SCORE = 1 << 30
+CAPTURE_SCORE = 1 << 28
+KILLER_SCORE = 1 << 27
+# history scores are halved once one of them passes this, so they stay below KILLER_SCORE
+HISTORY_LIMIT = 1 << 20
+
+
+class MoveOrderer:
+    """
+    Move ordering for alpha-beta searches over encoded moves (see moves.py):
+    the hash move, then captures with the most valuable victim and least valuable
+    attacker first (PIECE_VALUES, the bots' SCORES_DICT), then the two killer moves
+    of the ply, then the other quiet moves by their history score, a butterfly
+    table indexed by start * 36 + end, and last the captures that lose material by
+    static exchange (BitBoard.see).
+    A bot keeps one orderer, calls new_search() before each move and
+    record_cutoff() whenever a move fails high.
+    """
+    def __init__(self, max_ply=MAX_PLY):
+        self.max_ply = max_ply
+        self.killers = [[NO_MOVE, NO_MOVE] for _ in range(max_ply)]
+        self.history = array("l", [0]) * (36 * 36)
+
+    def clear(self):
+        self.killers = [[NO_MOVE, NO_MOVE] for _ in range(self.max_ply)]
+        self.history = array("l", [0]) * (36 * 36)
+
+    def new_search(self):
+        # killers belong to the previous position; history is kept but fades
+        for killers in self.killers:
+            killers[0] = killers[1] = NO_MOVE
+        self.age_history()
+
+    def age_history(self):
+        history = self.history
+        for i in range(len(history)):
+            history[i] >>= 1
+
+    def get_killers(self, ply):
+        if ply < self.max_ply:
+            return tuple(self.killers[ply])
+        return (NO_MOVE, NO_MOVE)
+
+    def iter_moves(self, board, ply, hash_move=NO_MOVE):
+        # Lazy, staged: captures come from BitBoard.iter_captures already in MVV-LVA
+        # order, and the quiet moves are only generated and sorted once the hash move,
+        # the captures and the killers have all failed to cut off.
+        bitboard = board.bitboard
+        color = board.turn
+        if hash_move != NO_MOVE and bitboard.is_valid_move(hash_move, color):
+            yield hash_move
+        else:
+            hash_move = NO_MOVE
+        losing = []
+        for move in bitboard.iter_captures(color):
+            if move != hash_move:
+                if bitboard.is_losing_capture(move):
+                    losing.append(move)
+                else:
+                    yield move
+        killers = self.get_killers(ply)
+        for move in killers:
+            if (
+                move != NO_MOVE
+                and move != hash_move
+                and not bitboard.is_capture(move)
+                and bitboard.is_valid_move(move, color)
+            ):
+                yield move
+        history = self.history
+        quiet = sorted(
+            bitboard.iter_quiet_moves(color),
+            key=lambda move: history[move & SQUARES_MASK],
+            reverse=True,
+        )
+        for move in quiet:
+            if move != hash_move and move not in killers:
+                yield move
+        yield from losing
+
+    def score_move(self, board, move, ply, hash_move=NO_MOVE):
+        if move == hash_move:
+            return HASH_SCORE
+        start, end = divmod(move & SQUARES_MASK, 36)
+        mailbox = board.bitboard.mailbox
+        if mailbox[end] != EMPTY:
+            score = PIECE_VALUES[mailbox[end] & 7] * 128 - PIECE_VALUES[mailbox[start] & 7]
+            if board.bitboard.is_losing_capture(move):
+                return score - CAPTURE_SCORE
+            return CAPTURE_SCORE + score
+        killers = self.get_killers(ply)
+        if move == killers[0]:
+            return KILLER_SCORE + 1
+        if move == killers[1]:
+            return KILLER_SCORE
+        return self.history[move & SQUARES_MASK]
+
+    def order_moves(self, board, moves, ply, hash_move=NO_MOVE):
+        # the same order as iter_moves for an already generated list (e.g. board.get_move_array)
+        return sorted(moves, key=lambda move: self.score_move(board, move, ply, hash_move), reverse=True)
+
+    def record_cutoff(self, board, move, depth, ply):
+        # call with the move undone again; captures are already ordered well enough
+        if board.bitboard.is_capture(move):
+            return
+        if ply < self.max_ply:
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+        index = move & SQUARES_MASK
+        self.history[index] += depth * depth
+        if self.history[index] > HISTORY_LIMIT:
+            self.age_history()
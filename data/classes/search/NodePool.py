@@ -0,0 +1,102 @@
+# /* NodePool.py
+from array import array
+
+from data.classes.moves import SQUARES_MASK
+
+NO_CHILDREN = -1
+
+
+class NodePool:
+    """
+    Search tree for Monte Carlo tree search, kept as parallel arrays indexed by node
+    instead of a Python object per node. The children of a node are created together,
+    so they sit next to each other from first_child[node] on.
+    value[node] is the sum of the playout results (0 to 1) for the side that made the
+    move into node, so value / visits is how good that move has turned out for it.
+    key[node] is the Zobrist key of the position at node, set by the first playout
+    through it (0 until then).
+    """
+    def __init__(self, capacity=200000):
+        # the bot starts a new tree rather than grow this one past capacity
+        self.capacity = capacity
+        self.clear()
+
+    def clear(self):
+        self.move = array("H")
+        self.first_child = array("l")
+        self.child_count = array("H")
+        self.visits = array("l")
+        self.value = array("d")
+        self.key = array("Q")
+
+    def __len__(self):
+        return len(self.move)
+
+    def is_full(self):
+        return len(self.move) >= self.capacity
+
+    def add_root(self, move, key=0):
+        # a node with no parent, e.g. for the current position; returns its index
+        self.move.append(move)
+        self.first_child.append(NO_CHILDREN)
+        self.child_count.append(0)
+        self.visits.append(0)
+        self.value.append(0.0)
+        self.key.append(key)
+        return len(self.move) - 1
+
+    def expand(self, node, moves):
+        # adds a child per encoded move in moves (an array("H"))
+        count = len(moves)
+        self.first_child[node] = len(self.move)
+        self.child_count[node] = count
+        self.move.extend(moves)
+        self.first_child.extend(array("l", [NO_CHILDREN]) * count)
+        self.child_count.extend(array("H", bytes(2 * count)))
+        self.visits.extend(array("l", bytes(array("l").itemsize * count)))
+        self.value.extend(array("d", bytes(8 * count)))
+        self.key.extend(array("Q", bytes(8 * count)))
+
+    def children(self, node):
+        first = self.first_child[node]
+        if first == NO_CHILDREN:
+            return range(0)
+        return range(first, first + self.child_count[node])
+
+    def find_child(self, node, squares):
+        # the child whose move goes start * 36 + end == squares, or None
+        for child in self.children(node):
+            if self.move[child] & SQUARES_MASK == squares:
+                return child
+        return None
+
+    def most_visited_child(self, node):
+        return max(self.children(node), key=self.visits.__getitem__)
+
+    def compact(self, node):
+        # Keeps only the subtree under node, which becomes the root (index 0), and drops
+        # everything else. Nodes are copied level by level, so children stay together.
+        move, first_child, child_count = self.move, self.first_child, self.child_count
+        visits, value, key = self.visits, self.value, self.key
+        old = [node]
+        self.clear()
+        self.add_root(move[node], key[node])
+        self.visits[0] = visits[node]
+        self.value[0] = value[node]
+        # old[i] is the node copied to index i
+        i = 0
+        while i < len(old):
+            first = first_child[old[i]]
+            if first != NO_CHILDREN:
+                count = child_count[old[i]]
+                self.first_child[i] = len(self.move)
+                self.child_count[i] = count
+                self.move.extend(move[first:first + count])
+                self.first_child.extend(array("l", [NO_CHILDREN]) * count)
+                self.child_count.extend(array("H", bytes(2 * count)))
+                self.visits.extend(visits[first:first + count])
+                self.value.extend(value[first:first + count])
+                self.key.extend(key[first:first + count])
+                old.extend(range(first, first + count))
+            i += 1
+        return 0
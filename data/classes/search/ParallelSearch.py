@@ -0,0 +1,163 @@
+# /* ParallelSearch.py
+import multiprocessing
+import pickle
+
+from data.classes.moves import move_to_tuple
+from data.classes.search.iterative_deepening import SearchTimeout
+from data.classes.search.SharedTranspositionTable import SharedTranspositionTable
+
+# the SearchBot attributes a worker copies from the bot it searches for
+SEARCH_OPTIONS = (
+    "quiescence",
+    "value_scale",
+    "delta_margin",
+    "see_pruning",
+    "pvs",
+    "aspiration",
+    "aspiration_window",
+    "null_window",
+    "null_move",
+    "null_move_reduction",
+    "lmr",
+    "lmr_moves",
+    "futility",
+    "futility_margin",
+)
+
+# state of a worker process, set up once by _init_worker
+_worker = {}
+
+
+def _init_worker(bot_class, evaluate_board, alpha, table_name):
+    bot = bot_class()
+    if evaluate_board is not None:
+        bot.evaluate_board = evaluate_board
+    if table_name is not None:
+        bot.tt = SharedTranspositionTable(name=table_name)
+    _worker["bot"] = bot
+    _worker["shared_table"] = table_name is not None
+    _worker["alpha"] = alpha
+    _worker["position"] = None
+    _worker["board"] = None
+
+
+def _search_move(task):
+    # one root move, searched like the later moves of SearchBot.search_root:
+    # a null window just under the best score any process has found so far, and the
+    # full window again if the move beats it.
+    # Returns (move, value or None if the deadline passed, PV from the move, nodes, q_nodes).
+    position, board_data, side, options, pv_line, depth, move, alpha, beta, deadline = task
+    bot = _worker["bot"]
+    shared_alpha = _worker["alpha"]
+    if _worker["position"] != position:
+        _worker["position"] = position
+        _worker["board"] = pickle.loads(board_data)
+        bot.__dict__.update(options)
+        if _worker["shared_table"]:
+            # only the bot's own process clears and ages a shared table
+            bot.tt_side = side
+        bot.reset_table(side)
+        bot.orderer.new_search()
+    board = _worker["board"]
+    bot.deadline = deadline
+    bot.pv_line = pv_line
+    bot.nodes = bot.q_nodes = 0
+    stack_size = len(board.move_stack)
+    try:
+        a = max(alpha, shared_alpha.value - bot.null_window)
+        board.push(move)
+        value = -bot.ab_minimax(board, side, depth - 1, -a - bot.null_window, -a)
+        if a < value < beta:
+            value = -bot.ab_minimax(board, side, depth - 1, -beta, -a)
+        line = [move] + bot.pv[1]
+        board.pop()
+    except SearchTimeout:
+        while len(board.move_stack) > stack_size:
+            board.pop()
+        return move, None, [], bot.nodes, bot.q_nodes
+    if value > a:
+        with shared_alpha.get_lock():
+            if value > shared_alpha.value:
+                shared_alpha.value = value
+    return move, value, line, bot.nodes, bot.q_nodes
+
+
+class ParallelSearch:
+    """
+    Root-split parallel search for a SearchBot. The bot searches its first (best
+    ordered) root move itself. The other root moves are then handed out to a pool of
+    worker processes, each with its own copy of the bot and its move ordering.
+    Workers share alpha: the best score so far lives in shared memory,
+    and every worker starts its null window just under it. So a good move found by one
+    worker narrows the search of the moves still to come on all the others.
+    Given the name of the bot's SharedTranspositionTable, the workers attach to that
+    table instead of keeping their own, so none of them repeats work another has stored.
+    The pool is started once, when the object is made, and reused for every move;
+    call close() when done with it.
+    """
+    def __init__(self, bot, processes, table_name=None):
+        self.processes = processes
+        self.alpha = multiprocessing.Value("d", float("-inf"))
+        evaluate_board = bot.__dict__.get("evaluate_board")
+        self.pool = multiprocessing.Pool(
+            processes, initializer=_init_worker, initargs=(type(bot), evaluate_board, self.alpha, table_name)
+        )
+        self.position = 0
+        self.board_data = None
+        # root moves searched by the workers, and how many of them ran out of time
+        self.tasks = 0
+        self.timeouts = 0
+
+    def new_position(self, board):
+        # call once per move, before searching board; the workers load it on their next task
+        self.position += 1
+        self.board_data = pickle.dumps(board)
+
+    def search_root(self, bot, board, side, depth, alpha, beta):
+        # the same result as SearchBot.search_root: (best score, moves with that score,
+        # PV of each of them)
+        moves = bot.order_root_moves(board, side)
+        first = moves[0]
+        move = board.encode_move(first)
+        bot.simulate_move(board, *first)
+        best_value = -bot.ab_minimax(board, side, depth - 1, -beta, -alpha)
+        board.pop()
+        best_move = [first]
+        lines = {first: [move] + bot.pv[1]}
+        if best_value >= beta or len(moves) == 1:
+            return best_value, best_move, lines
+
+        self.alpha.value = best_value if best_value > alpha else float("-inf")
+        options = {name: getattr(bot, name) for name in SEARCH_OPTIONS}
+        pv_line = bot.pv_line
+        tasks = [
+            (self.position, self.board_data, side, options, pv_line, depth,
+             board.encode_move(root_move), alpha, beta, bot.deadline)
+            for root_move in moves[1:]
+        ]
+        timed_out = False
+        # every task is collected, even after a timeout, so none of them is still
+        # running on a worker when the next search starts
+        for move, value, line, nodes, q_nodes in self.pool.imap_unordered(_search_move, tasks):
+            self.tasks += 1
+            bot.nodes += nodes
+            bot.q_nodes += q_nodes
+            if value is None:
+                self.timeouts += 1
+                timed_out = True
+                continue
+            root_move = move_to_tuple(move)
+            if value > best_value:
+                best_value = value
+                best_move = [root_move]
+            elif value == best_value:
+                best_move.append(root_move)
+            if value == best_value:
+                lines[root_move] = line
+        if timed_out:
+            raise SearchTimeout()
+        return best_value, best_move, lines
+
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
@@ -0,0 +1,129 @@
+# /* Ponderer.py
+import multiprocessing
+import pickle
+import time
+
+from data.classes.search.iterative_deepening import SearchTimeout
+from data.classes.search.SharedTranspositionTable import SharedTranspositionTable
+
+
+def _ponder_worker(conn, stop, bot_class, evaluate_board, table_name):
+    bot = bot_class()
+    if evaluate_board is not None:
+        bot.evaluate_board = evaluate_board
+    if table_name is not None:
+        bot.tt = SharedTranspositionTable(name=table_name)
+    # the search polls this and stops with SearchTimeout once finish() sets it
+    bot.stop = stop
+    while True:
+        job = conn.recv()
+        if job is None:
+            break
+        ponder_id, board_data, side, options, max_depth = job
+        board = pickle.loads(board_data)
+        bot.__dict__.update(options)
+        if table_name is not None:
+            # only the bot's own process clears and ages a shared table
+            bot.tt_side = side
+        bot.reset_table(side)
+        bot.orderer.new_search()
+        bot.best_root_move = None
+        bot.root_score = None
+        bot.pv_line = []
+        bot.nodes = bot.q_nodes = 0
+        try:
+            for depth in range(1, max_depth + 1):
+                if stop.is_set():
+                    break
+                try:
+                    move = bot.get_best_move_minimax(board, side, depth)
+                except SearchTimeout:
+                    break
+                conn.send((ponder_id, depth, move, bot.root_score, bot.pv_line, bot.nodes, bot.q_nodes))
+        finally:
+            # finish() waits for this, whatever happened to the search
+            conn.send((ponder_id, None, None, None, None, None, None))
+    if table_name is not None:
+        bot.tt.close()
+
+
+class Ponderer:
+    """
+    Searches on the opponent's time. After the bot has chosen its move, start() hands
+    the position after that move and the reply the bot expects (the second move of its
+    PV) to a background process. That process searches it for the bot, one depth after
+    another, until finish() stops it.
+    finish() returns the deepest completed result, which the bot only uses if the
+    opponent did play the expected reply (a ponder hit). Either way the search has filled
+    the bot's transposition table when it shares one (SharedTranspositionTable).
+    The process is started once, when the object is made; call close() when done with it.
+    If the process dies or stops answering, finish() gives up after finish_timeout
+    seconds and alive turns False; the Ponderer is of no further use then.
+    """
+    def __init__(self, bot, table_name=None):
+        self.stop = multiprocessing.Event()
+        self.conn, child = multiprocessing.Pipe()
+        evaluate_board = bot.__dict__.get("evaluate_board")
+        self.process = multiprocessing.Process(
+            target=_ponder_worker,
+            args=(child, self.stop, type(bot), evaluate_board, table_name),
+            daemon=True,
+        )
+        self.process.start()
+        self.ponder_id = 0
+        # Zobrist key of the position being searched, None while idle
+        self.key = None
+        self.alive = True
+        # longest finish() waits for the search to stop, on the bot's own clock
+        self.finish_timeout = 0.02
+
+    def start(self, board, side, options, max_depth):
+        # board is the position to search for side, i.e. with the expected reply pushed
+        if not self.alive:
+            return
+        self.ponder_id += 1
+        try:
+            self.conn.send((self.ponder_id, pickle.dumps(board), side, options, max_depth))
+        except OSError:
+            self.alive = False
+            return
+        self.key = board.zobrist_key
+
+    def finish(self):
+        # stops the search; (depth, move, score, PV, nodes, quiescence nodes) of its deepest
+        # completed depth, the node counts taken over all its depths, or None
+        if self.key is None:
+            return None
+        self.key = None
+        self.stop.set()
+        result = None
+        deadline = time.perf_counter() + self.finish_timeout
+        try:
+            while True:
+                if not self.conn.poll(max(0, deadline - time.perf_counter())):
+                    # the process is hung or gone
+                    self.alive = False
+                    return None
+                ponder_id, depth, move, score, pv_line, nodes, q_nodes = self.conn.recv()
+                if ponder_id != self.ponder_id:
+                    continue
+                if depth is None:
+                    break
+                result = (depth, move, score, pv_line, nodes, q_nodes)
+        except (EOFError, OSError):
+            self.alive = False
+            return None
+        self.stop.clear()
+        return result
+
+    def close(self):
+        self.finish()
+        if self.alive:
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+            self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=1)
@@ -0,0 +1,137 @@
+# /* ProofNumberSearch.py
+from data.classes.BitBoard import KING, COLOR_INDEX, COLOR_NAMES
+from data.classes.moves import NO_MOVE, SQUARES_MASK
+
+# proof and disproof numbers stop here; a node at INF is settled
+INF = 10 ** 9
+
+PROVEN, DISPROVEN, UNKNOWN = range(3)
+
+
+class ProofNumberSearch:
+    """
+    Depth-first proof-number search (df-pn) for a forced king capture: can the side
+    to move take the enemy king within max_plies of its own moves, whatever the other
+    side plays? The game ends when a king is taken, so this settles positions that
+    alpha-beta would need a full-width search of the same depth for.
+    Only moves that attack the enemy king are tried for the attacking side, while every
+    reply is tried for the defender. A proof is a real forced win; a disproof only says
+    there is no forced sequence of such threats within max_plies.
+    Numbers are kept per node as (phi, delta) for the side to move there: phi is the
+    proof number when that side is the attacker and the disproof number when it
+    defends, delta the other one. A node where the side to move wins has phi 0.
+    The search stops at max_nodes, leaving the answer UNKNOWN.
+    """
+    def __init__(self, max_plies=3, max_nodes=2000):
+        self.max_plies = max_plies
+        self.max_nodes = max_nodes
+        self.nodes = 0
+        # (Zobrist key, attacker moves left) -> (phi, delta)
+        self.table = {}
+        # the first move of the proof, once PROVEN (encoded as in moves.py)
+        self.best_move = NO_MOVE
+
+    def prove(self, board, side):
+        # PROVEN, DISPROVEN or UNKNOWN for side, the side to move on board
+        bitboard = board.bitboard
+        color = COLOR_INDEX[side]
+        self.nodes = 0
+        self.table = {}
+        self.best_move = NO_MOVE
+        capture = self.king_capture(bitboard, color)
+        if capture != NO_MOVE:
+            self.best_move = capture
+            return PROVEN
+        phi, delta = self.search(bitboard, color, True, self.max_plies, INF - 1, INF - 1)
+        if phi == 0:
+            self.best_move = self.proof_move(bitboard, color)
+            return PROVEN
+        if delta == 0:
+            return DISPROVEN
+        return UNKNOWN
+
+    def king_capture(self, bitboard, color):
+        # a move of color's that takes the enemy king, or NO_MOVE
+        king = bitboard.pieces[color ^ 1][KING]
+        if not king:
+            return NO_MOVE
+        square = king.bit_length() - 1
+        attackers = bitboard.attackers_to(square, color)
+        if not attackers:
+            return NO_MOVE
+        return bitboard.encode_move(attackers.bit_length() - 1, square)
+
+    def children(self, bitboard, color, attacking):
+        # the moves searched from this node, threats to the king for the attacker and
+        # every move for the defender, and the Zobrist key after each of them
+        moves = []
+        keys = []
+        king = bitboard.pieces[color ^ 1][KING].bit_length() - 1
+        for move in bitboard.get_move_array(COLOR_NAMES[color]):
+            bitboard.push(*divmod(move & SQUARES_MASK, 36))
+            if not attacking or bitboard.attackers_to(king, color):
+                moves.append(move)
+                keys.append(bitboard.key)
+            bitboard.pop()
+        return moves, keys
+
+    def search(self, bitboard, color, attacking, plies, phi_limit, delta_limit):
+        # (phi, delta) of the position for color, the side to move; attacking is whether
+        # color is the side trying to take the king, plies the attacker's moves left
+        # before the capture
+        self.nodes += 1
+        key = (bitboard.key, plies)
+        if self.king_capture(bitboard, color) != NO_MOVE:
+            # the side to move wins, attacker or not
+            self.table[key] = (0, INF)
+            return 0, INF
+        if attacking and plies == 0:
+            self.table[key] = (INF, 0)
+            return INF, 0
+        moves, child_keys = self.children(bitboard, color, attacking)
+        if not moves:
+            # the attacker has no threat left, or the defender no move: the defender holds
+            result = (INF, 0) if attacking else (0, INF)
+            self.table[key] = result
+            return result
+        child_plies = plies - 1 if attacking else plies
+        table = self.table
+        while True:
+            # phi is the smallest delta of the children, delta the sum of their phi;
+            # the child to search is the one with the smallest delta
+            phi = INF
+            delta = 0
+            best = None
+            best_phi = second_delta = INF
+            for move, child_key in zip(moves, child_keys):
+                child_phi, child_delta = table.get((child_key, child_plies), (1, 1))
+                delta = min(delta + child_phi, INF)
+                if child_delta < phi:
+                    second_delta = phi
+                    phi = child_delta
+                    best = move
+                    best_phi = child_phi
+                elif child_delta < second_delta:
+                    second_delta = child_delta
+            if phi >= phi_limit or delta >= delta_limit or self.nodes >= self.max_nodes:
+                break
+            bitboard.push(*divmod(best & SQUARES_MASK, 36))
+            self.search(
+                bitboard,
+                color ^ 1,
+                not attacking,
+                child_plies,
+                delta_limit - delta + best_phi,
+                min(phi_limit, second_delta + 1),
+            )
+            bitboard.pop()
+        self.table[key] = (phi, delta)
+        return phi, delta
+
+    def proof_move(self, bitboard, color):
+        # the root move whose child was disproven for the defender
+        moves, keys = self.children(bitboard, color, True)
+        for move, key in zip(moves, keys):
+            if self.table.get((key, self.max_plies - 1), (1, 1))[1] == 0:
+                return move
+        return NO_MOVE
@@ -0,0 +1,486 @@
+# /* SearchBot.py
+import os
+import random
+import time
+
+from data.classes.BitBoard import PIECE_VALUES, PAWN, JOKER
+from data.classes.moves import NO_MOVE, PROMOTION_FLAG, move_end, move_to_tuple
+from data.classes.search.TranspositionTable import TranspositionTable, EXACT, LOWER, UPPER
+from data.classes.search.iterative_deepening import iterative_deepening, SearchTimeout
+from data.classes.search.MoveOrderer import MoveOrderer, MAX_PLY
+from data.classes.search.ParallelSearch import ParallelSearch, SEARCH_OPTIONS
+from data.classes.search.Ponderer import Ponderer
+from data.classes.search.ProofNumberSearch import ProofNumberSearch, PROVEN
+from data.classes.search.SharedTranspositionTable import SharedTranspositionTable
+
+
+class SearchBot:
+    """
+    The alpha-beta search shared by the bots: iterative deepening under a deadline,
+    a transposition table, staged move ordering, PVS with aspiration windows,
+    null-move pruning, late move reductions, futility pruning and a quiescence
+    search. Only the evaluation is left to the bot.
+    Subclass it and define evaluate_board(side, board), the score of board for side
+    (higher is better for side), or pass that function in as evaluate_board.
+    The attributes set in __init__ are the search options; change them after
+    calling SearchBot.__init__. value_scale must match the evaluation's units.
+    """
+    def __init__(self, evaluate_board=None):
+        self.depth = 8  # deepest iteration; the time limit normally ends the search first
+        self.time_limit_ms = 80  # deadline for each move, under the 0.1 second limit in rules.md
+        self.deadline = float('inf')
+        # an Event (e.g. multiprocessing.Event) that stops the search when set, like the
+        # deadline passing; set by the Ponderer for its background search
+        self.stop = None
+        self.best_root_move = None
+        # depth of the last fully searched iteration, for the last move and for every move
+        self.depth_reached = 0
+        self.depth_history = []
+        # transposition table shared across this bot's moves; hits/misses in self.tt.stats()
+        self.tt = TranspositionTable(size_mb=8)
+        self.tt_side = None
+        # hash move / MVV-LVA / killer / history ordering for ab_minimax
+        self.orderer = MoveOrderer()
+        # quiescence search at the leaves: captures only, with delta pruning
+        self.quiescence = True
+        self.value_scale = 1  # evaluate_board units per PIECE_VALUES unit
+        self.delta_margin = 2  # in PIECE_VALUES units, for the positional terms a capture can swing
+        self.see_pruning = True  # skip captures that lose material once the exchange is played out
+        # nodes searched by ab_minimax and by quiesce for the last move, and per move
+        self.nodes = 0
+        self.q_nodes = 0
+        self.node_history = []
+        # principal variation search and aspiration windows around the last depth's score
+        self.pvs = True
+        self.aspiration = True
+        self.aspiration_window = 1  # in PIECE_VALUES units, scaled by value_scale
+        self.null_window = 1e-9  # scores are floats; the smallest difference the search tells apart
+        self.root_score = None
+        # triangular PV table: pv[ply] is the best line found from ply on
+        self.pv = [[] for _ in range(MAX_PLY + 1)]
+        # principal variation of the last move, as ((x, y), (x, y)) tuples from the root
+        self.pv_line = []
+        # selective search, each can be switched off to compare nodes and strength
+        self.null_move = True
+        self.null_move_reduction = 2
+        self.lmr = True
+        self.lmr_moves = 3  # moves searched at full depth before later quiet moves are reduced
+        self.futility = True
+        self.futility_margin = 2  # in PIECE_VALUES units, scaled by value_scale
+        # worker processes to split the root moves over (ParallelSearch), at most one less
+        # than the CPUs; 0 searches here only. The pool is started by start() (or the first
+        # move) and kept until close()
+        self.processes = 0
+        self.parallel = None
+        # with worker processes (the pool or pondering), this process and the workers probe
+        # and store one table in shared memory (SharedTranspositionTable) instead of a table each
+        self.shared_table = True
+        # search the expected reply on the opponent's time in a background process
+        # (Ponderer); started by start() (or the first move) and kept until close()
+        self.ponder = False
+        self.ponderer = None
+        self.ponder_result = None
+        self.ponder_hits = 0
+        self.ponder_misses = 0
+        # time kept back from the search for handing the next position to the Ponderer
+        # after it (pickling the board and sending it), or the longest handoff so far
+        self.ponder_reserve_ms = 15
+        self.handoff_time = 0
+        # before searching, look for a forced king capture with a proof-number search
+        # (ProofNumberSearch) and play it straight away if one is found
+        self.proof_search = False
+        self.proof_plies = 5  # our moves before the capture
+        self.proof_nodes = 400  # node budget, so the pre-pass leaves the search its time
+        self.proofs = 0
+        if evaluate_board is not None:
+            self.evaluate_board = evaluate_board
+
+    def opponent(self, side):
+        return 'black' if side == 'white' else 'white'
+
+    def reset_table(self, side):
+        # stored scores are relative to the side we search for
+        if side != self.tt_side:
+            if self.tt_side is not None:
+                self.tt.clear()
+            self.tt_side = side
+        self.tt.new_search()
+
+    def get_possible_moves(self, side, board):
+        return board.get_all_valid_moves(side)
+
+    def evaluate_board(self, side, board):
+        raise NotImplementedError("SearchBot needs an evaluate_board(side, board)")
+
+    def evaluate(self, board, side):
+        # evaluate_board scores for side; negamax wants the side to move's point of view
+        evaluation = self.evaluate_board(side, board)
+        return evaluation if board.turn == side else -evaluation
+
+    def ab_minimax(self, board, side, depth, a, b, ply=1):
+        # negamax alpha-beta: scores are from the side to move's point of view
+        if time.perf_counter() >= self.deadline or (self.stop is not None and self.stop.is_set()):
+            raise SearchTimeout()
+        self.nodes += 1
+        self.pv[ply] = []
+
+        if board.is_in_checkmate(board.turn):
+            return self.evaluate(board, side)
+        if depth == 0:
+            if self.quiescence:
+                return self.quiesce(board, side, a, b)
+            return self.evaluate(board, side)
+
+        key = board.zobrist_key
+        entry = self.tt.probe(key)
+        hash_move = NO_MOVE
+        if entry is not None:
+            hash_move = entry[3]
+        elif ply < len(self.pv_line):
+            # no table move: try the previous iteration's PV move for this ply
+            hash_move = board.encode_move(self.pv_line[ply])
+        if entry is not None and entry[2] >= depth:
+            score, bound = entry[0], entry[1]
+            if bound == EXACT:
+                return score
+            if bound == LOWER:
+                a = max(a, score)
+            else:
+                b = min(b, score)
+            if a >= b:
+                return score
+
+        bitboard = board.bitboard
+        # a null window is null_window wide, give or take float rounding
+        pv_node = b - a > 2 * self.null_window
+        # in danger: our king could be captured next move, so passing or pruning quiet moves is unsafe
+        in_danger = bitboard.is_king_attacked(board.turn)
+
+        # Null move: let the opponent move twice; if a shallow search still fails high the
+        # position is good enough to cut. Not on PV nodes, not twice in a row, not with the
+        # king attacked, and not with only king and pawns left, where passing can be
+        # better than any move (zugzwang).
+        if (
+            self.null_move
+            and not pv_node
+            and not in_danger
+            and depth > self.null_move_reduction
+            and board.move_stack[-1] is not None
+            and bitboard.has_non_pawn_material(board.turn)
+            and self.evaluate(board, side) >= b
+        ):
+            board.push_null()
+            value = -self.ab_minimax(
+                board, side, depth - 1 - self.null_move_reduction, -b, -b + self.null_window, ply + 1
+            )
+            board.pop()
+            if value >= b:
+                return value
+
+        # futility: at the frontier, quiet moves cannot lift a hopeless static score to alpha
+        futile = (
+            self.futility
+            and depth == 1
+            and not pv_node
+            and not in_danger
+            and self.evaluate(board, side) + self.futility_margin * self.value_scale <= a
+        )
+
+        a_orig = a
+        best_value = float('-inf')
+        best_move = NO_MOVE
+        moves_searched = 0
+        # hash move, captures, killers, then quiet moves by history
+        for move in self.orderer.iter_moves(board, ply, hash_move):
+            quiet = not move & PROMOTION_FLAG and not bitboard.is_capture(move)
+            if futile and quiet and moves_searched:
+                continue
+            board.push(move)
+            if not moves_searched:
+                value = -self.ab_minimax(board, side, depth - 1, -b, -a, ply + 1)
+            else:
+                value = None
+                if (
+                    self.lmr
+                    and quiet
+                    and not in_danger
+                    and depth >= 3
+                    and moves_searched >= self.lmr_moves
+                ):
+                    # late move reduction: a null-window search one ply shallower first
+                    value = -self.ab_minimax(board, side, depth - 2, -a - self.null_window, -a, ply + 1)
+                    if value > a:
+                        value = None
+                if value is None and self.pvs:
+                    # PVS: prove the move is no better than the first with a null window,
+                    # and search it again with the full window only if that fails
+                    value = -self.ab_minimax(board, side, depth - 1, -a - self.null_window, -a, ply + 1)
+                    if a < value < b:
+                        value = None
+                if value is None:
+                    value = -self.ab_minimax(board, side, depth - 1, -b, -a, ply + 1)
+            board.pop()
+            moves_searched += 1
+            if value > best_value:
+                best_value = value
+                best_move = move
+                if value > a:
+                    a = value
+                    self.pv[ply] = [move] + self.pv[ply + 1]
+                    if a >= b:
+                        self.orderer.record_cutoff(board, move, depth, ply)
+                        break
+        if best_move == NO_MOVE:
+            return self.evaluate(board, side)
+
+        if best_value <= a_orig:
+            bound = UPPER
+        elif best_value >= b:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.tt.store(key, depth, best_value, bound, best_move)
+        return best_value
+
+    def quiesce(self, board, side, a, b):
+        # captures only, until the position is quiet; scored like ab_minimax
+        if time.perf_counter() >= self.deadline or (self.stop is not None and self.stop.is_set()):
+            raise SearchTimeout()
+        self.q_nodes += 1
+
+        # stand pat: the side to move does not have to capture
+        best_value = self.evaluate(board, side)
+        if best_value >= b or board.is_in_checkmate(board.turn):
+            return best_value
+        if best_value > a:
+            a = best_value
+
+        bitboard = board.bitboard
+        mailbox = bitboard.mailbox
+        scale = self.value_scale
+        margin = best_value + self.delta_margin * scale
+        for move in bitboard.iter_captures(board.turn):
+            gain = PIECE_VALUES[mailbox[move_end(move)] & 7]
+            if move & PROMOTION_FLAG:
+                gain += PIECE_VALUES[JOKER] - PIECE_VALUES[PAWN]
+            # delta pruning: even winning the piece for free would not reach alpha
+            if margin + gain * scale <= a:
+                continue
+            if self.see_pruning and bitboard.is_losing_capture(move):
+                continue
+            board.push(move)
+            value = -self.quiesce(board, side, -b, -a)
+            board.pop()
+            if value > best_value:
+                best_value = value
+                if value > a:
+                    a = value
+                    if a >= b:
+                        break
+        return best_value
+
+    def get_best_move_minimax(self, board, side, depth, deadline=float('inf')):
+        # one search of the root to the given depth; raises SearchTimeout after deadline.
+        # The window starts around the previous depth's score (aspiration) and is opened
+        # up on whichever side the result falls outside it.
+        self.deadline = deadline
+        alpha, beta = float('-inf'), float('inf')
+        if self.aspiration and self.root_score is not None:
+            window = self.aspiration_window * self.value_scale
+            alpha, beta = self.root_score - window, self.root_score + window
+        while True:
+            if self.parallel is not None:
+                value, best_move, lines = self.parallel.search_root(self, board, side, depth, alpha, beta)
+            else:
+                value, best_move, lines = self.search_root(board, side, depth, alpha, beta)
+            if alpha > float('-inf') and value <= alpha:
+                alpha = float('-inf')
+            elif beta < float('inf') and value >= beta:
+                beta = float('inf')
+            else:
+                break
+        self.root_score = value
+        self.best_root_move = best_move[0] if len(best_move) == 1 else random.choice(best_move)
+        self.pv_line = [move_to_tuple(move) for move in lines[self.best_root_move]]
+        return self.best_root_move
+
+    def order_root_moves(self, board, side):
+        # the previous iteration's choice first, then the same ordering as below the root
+        hash_move = NO_MOVE if self.best_root_move is None else board.encode_move(self.best_root_move)
+        return sorted(
+            board.get_all_valid_moves(side),
+            key=lambda move: self.orderer.score_move(board, board.encode_move(move), 0, hash_move),
+            reverse=True,
+        )
+
+    def search_root(self, board, side, depth, alpha, beta):
+        # (best score, moves with that score, PV of each of them)
+        best_move = []
+        best_value = float('-inf')
+        lines = {}
+        for init_pos, end_pos in self.order_root_moves(board, side):
+            move = board.encode_move((init_pos, end_pos))
+            self.simulate_move(board, init_pos, end_pos)
+            # just under the best score so far: worse moves are cut off, ties still come back exact
+            a = max(alpha, best_value - self.null_window)
+            if not best_move or not self.pvs:
+                move_value = -self.ab_minimax(board, side, depth - 1, -beta, -a)
+            else:
+                move_value = -self.ab_minimax(board, side, depth - 1, -a - self.null_window, -a)
+                if a < move_value < beta:
+                    move_value = -self.ab_minimax(board, side, depth - 1, -beta, -a)
+            board.pop()
+            if move_value > best_value:
+                best_value = move_value
+                best_move = [(init_pos, end_pos)]
+            elif move_value == best_value:
+                best_move.append((init_pos, end_pos))
+            if move_value == best_value:
+                lines[(init_pos, end_pos)] = [move] + self.pv[1]
+            if best_value >= beta:
+                break
+        return best_value, best_move, lines
+
+    def start(self):
+        # Starts the worker processes asked for by processes and ponder. Call it once the
+        # options are set and before the game, as starting them takes longer than a move
+        # may; otherwise the first move starts them, against its own time.
+        workers = self.worker_processes()
+        if workers > 0 and self.parallel is None:
+            self.parallel = ParallelSearch(self, workers, self.share_table())
+        # the ponder process also needs a CPU of its own, left over after the workers
+        if self.ponder and self.ponderer is None and (os.cpu_count() or 1) - 1 - workers > 0:
+            self.ponderer = Ponderer(self, self.share_table())
+
+    def worker_processes(self):
+        # processes, but leaving a CPU for this process: workers that have to share
+        # the CPU with the main search only slow it down
+        return min(self.processes, (os.cpu_count() or 1) - 1)
+
+    def move(self, side, board):
+        start = time.perf_counter()
+        self.finish_pondering(board)
+        ponder_result, self.ponder_result = self.ponder_result, None
+        self.reset_table(side)
+        self.orderer.new_search()
+        self.nodes = 0
+        self.q_nodes = 0
+        self.best_root_move = None
+        self.root_score = None
+        self.pv_line = []
+        if ponder_result is not None:
+            # ponder hit: go on from the deepest depth searched on the opponent's time
+            depth, best_move, self.root_score, self.pv_line, nodes, q_nodes = ponder_result
+            if depth >= self.depth:
+                # the nodes the ponder search spent on this move, on the opponent's time
+                self.depth_history.append(depth)
+                self.node_history.append((nodes, q_nodes))
+                self.start_pondering(board, side, best_move)
+                return best_move
+            self.best_root_move = best_move
+        if self.proof_search:
+            prover = ProofNumberSearch(self.proof_plies, self.proof_nodes)
+            if prover.prove(board, side) == PROVEN:
+                self.proofs += 1
+                # counted as a search of proof_plies that visited the prover's nodes
+                self.depth_history.append(self.proof_plies)
+                self.node_history.append((prover.nodes, 0))
+                best_move = move_to_tuple(prover.best_move)
+                self.start_pondering(board, side, best_move)
+                return best_move
+        self.start()
+        if self.parallel is not None:
+            self.parallel.new_position(board)
+        deadline = start + self.time_limit_ms / 1000
+        if self.ponderer is not None:
+            deadline -= max(self.ponder_reserve_ms / 1000, self.handoff_time)
+        best_move, self.depth_reached = iterative_deepening(
+            board,
+            lambda depth, deadline: self.get_best_move_minimax(board, side, depth, deadline),
+            self.depth,
+            deadline,
+        )
+        self.depth_history.append(self.depth_reached)
+        self.node_history.append((self.nodes, self.q_nodes))
+        self.start_pondering(board, side, best_move)
+        return best_move
+
+    def opponent_moved(self, move, board):
+        # Hook for the game loop: the opponent has just played move, and board is the
+        # position after it. Stops the ponder search straight away instead of at the start
+        # of our next move(). Bots that do not ponder can ignore it.
+        self.finish_pondering(board)
+
+    def start_pondering(self, board, side, best_move):
+        # search the position after best_move and the reply we expect to it
+        if self.ponderer is None:
+            return
+        start = time.perf_counter()
+        board.push(best_move)
+        reply = NO_MOVE
+        if not board.is_in_checkmate(board.turn):
+            if len(self.pv_line) > 1 and self.pv_line[0] == best_move:
+                reply = board.encode_move(self.pv_line[1])
+            else:
+                reply = self.tt.get_move(board.zobrist_key)
+            if reply != NO_MOVE and not board.bitboard.is_valid_move(reply, board.turn):
+                reply = NO_MOVE
+        if reply != NO_MOVE:
+            board.push(reply)
+            if not board.is_in_checkmate(side):
+                options = {name: getattr(self, name) for name in SEARCH_OPTIONS}
+                self.ponderer.start(board, side, options, self.depth)
+            board.pop()
+        board.pop()
+        self.handoff_time = max(self.handoff_time, time.perf_counter() - start)
+        if not self.ponderer.alive:
+            self.drop_ponderer()
+
+    def finish_pondering(self, board):
+        # stops the ponder search, keeping its result in ponder_result if board is the
+        # position it searched
+        if self.ponderer is None or self.ponderer.key is None:
+            return
+        hit = board.zobrist_key == self.ponderer.key
+        result = self.ponderer.finish()
+        if hit and self.ponderer.alive:
+            self.ponder_hits += 1
+            self.ponder_result = result
+        else:
+            self.ponder_misses += 1
+        if not self.ponderer.alive:
+            self.drop_ponderer()
+
+    def drop_ponderer(self):
+        # the ponder process died or hung: stop pondering for good rather than start a
+        # new process on the clock of a later move
+        self.ponderer.close()
+        self.ponderer = None
+        self.ponder = False
+
+    def share_table(self):
+        # moves the transposition table into shared memory for other search processes,
+        # unless shared_table is off; the name to attach to it by, or None
+        if not self.shared_table:
+            return None
+        if not isinstance(self.tt, SharedTranspositionTable):
+            self.tt = SharedTranspositionTable(self.tt.size_mb)
+        return self.tt.name
+
+    def close(self):
+        # stops the worker processes of the parallel search and of pondering, if any,
+        # and frees the shared table
+        if self.ponderer is not None:
+            self.ponderer.close()
+            self.ponderer = None
+        if self.parallel is not None:
+            self.parallel.close()
+            self.parallel = None
+        if isinstance(self.tt, SharedTranspositionTable):
+            self.tt.close()
+            self.tt = TranspositionTable(size_mb=self.tt.size_mb)
+
+    def simulate_move(self, board, start_pos, end_pos):
+        # plays the move on board in place; undo it with board.pop()
+        board.push((start_pos, end_pos))
+        return board
@@ -0,0 +1,169 @@
+# /* SharedTranspositionTable.py
+import weakref
+from multiprocessing import shared_memory
+
+from data.classes.moves import NO_MOVE
+from data.classes.search.TranspositionTable import AGE_MASK
+
+# bytes per entry: 8 check + 8 score + 8 packed depth/bound/move/age
+ENTRY_BYTES = 24
+# the first 8 bytes of the block hold the table's age
+HEADER_BYTES = 8
+
+# scratch space to reinterpret a float's 64 bits as an int and back
+_scratch = memoryview(bytearray(8))
+_scratch_int = _scratch.cast("Q")
+_scratch_float = _scratch.cast("d")
+
+
+def _release(views, shm, owner):
+    # the views into the block have to go before the block itself
+    for view in views:
+        view.release()
+    shm.close()
+    if owner:
+        shm.unlink()
+
+
+class SharedTranspositionTable:
+    """
+    The TranspositionTable interface over a multiprocessing.shared_memory block, so
+    several search processes on one host can probe and store into the same table.
+    There are no locks. Each slot holds three 64-bit words (check, score bits, data),
+    with check = key ^ score bits ^ data. A reader takes the entry only if the XOR of
+    the three words it read gives back its key, so an entry torn by two processes
+    writing it at once reads as a miss instead of as a wrong result.
+    The size is fixed when the table is created. Other processes attach to it by name;
+    only the creating process should call new_search, and it unlinks the block on close()
+    (or, failing that, when the table is garbage collected or the interpreter exits).
+    Hit, miss and collision counts are kept per process.
+    """
+    def __init__(self, size_mb=8, name=None):
+        if name is None:
+            buckets = max(1, int(size_mb * 1024 * 1024) // (2 * ENTRY_BYTES))
+            self.shm = shared_memory.SharedMemory(
+                create=True, size=HEADER_BYTES + 2 * buckets * ENTRY_BYTES
+            )
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+            # the block can be rounded up to a whole page
+            buckets = (self.shm.size - HEADER_BYTES) // (2 * ENTRY_BYTES)
+        self.name = self.shm.name
+        self.buckets = buckets
+        self.size_mb = 2 * buckets * ENTRY_BYTES / (1024 * 1024)
+        size = 2 * buckets
+        block = self.shm.buf[:HEADER_BYTES + size * ENTRY_BYTES]
+        words = block.cast("Q")
+        self.header = words[:1]
+        self.checks = words[1:1 + size]
+        self.scores = words[1 + size:1 + 2 * size]
+        # move | bound << 16 | depth << 18 | age << 26, 0 for an empty slot
+        self.data = words[1 + 2 * size:1 + 3 * size]
+        # every view into the block, released again by close()
+        self.views = (self.header, self.checks, self.scores, self.data, words, block)
+        # frees the block once the table is garbage collected or at exit, for owners
+        # that never call close(); runs at most once
+        self._finalizer = weakref.finalize(self, _release, self.views, self.shm, self.owner)
+        self.reset_stats()
+
+    def clear(self):
+        size = HEADER_BYTES + 2 * self.buckets * ENTRY_BYTES
+        self.shm.buf[:size] = bytes(size)
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        # probes that found their bucket taken by other positions, and stores that
+        # replaced another position's entry
+        self.collisions = 0
+        self.overwrites = 0
+
+    @property
+    def age(self):
+        return self.header[0]
+
+    def new_search(self):
+        # entries from earlier searches become replaceable in the depth-preferred slots
+        if self.owner:
+            self.header[0] = (self.header[0] + 1) & AGE_MASK
+
+    def _read(self, slot, key):
+        # the slot's data word if it verifies against key, else 0
+        data = self.data[slot]
+        if data and self.checks[slot] ^ self.scores[slot] ^ data == key:
+            return data
+        return 0
+
+    def probe(self, key):
+        # (score, bound, depth, move) or None
+        first = (key % self.buckets) * 2
+        checks, scores, datas = self.checks, self.scores, self.data
+        for slot in (first, first + 1):
+            data = datas[slot]
+            if data:
+                bits = scores[slot]
+                if checks[slot] ^ bits ^ data == key:
+                    self.hits += 1
+                    _scratch_int[0] = bits
+                    return _scratch_float[0], data >> 16 & 3, data >> 18 & 0xFF, data & 0xFFFF
+        if datas[first] and datas[first + 1]:
+            self.collisions += 1
+        self.misses += 1
+        return None
+
+    def get_move(self, key):
+        # best move stored for key without touching the hit counters, or NO_MOVE
+        slot = (key % self.buckets) * 2
+        for i in (slot, slot + 1):
+            data = self._read(i, key)
+            if data:
+                return data & 0xFFFF
+        return NO_MOVE
+
+    def store(self, key, depth, score, bound, move=NO_MOVE):
+        slot = (key % self.buckets) * 2
+        age = self.header[0]
+        old = self.data[slot]
+        same = self._read(slot, key)
+        if not old or same or depth >= old >> 18 & 0xFF or old >> 26 != age:
+            if move == NO_MOVE and same:
+                move = same & 0xFFFF
+        else:
+            slot += 1
+            old = self.data[slot]
+            same = self._read(slot, key)
+        if old and not same:
+            self.overwrites += 1
+        data = move | bound << 16 | min(depth, 0xFF) << 18 | age << 26
+        _scratch_float[0] = score
+        bits = _scratch_int[0]
+        self.data[slot] = data
+        self.scores[slot] = bits
+        self.checks[slot] = key ^ bits ^ data
+        self.stores += 1
+
+    def fill_rate(self):
+        size = len(self.data)
+        return (size - self.data.tolist().count(0)) / size
+
+    def stats(self):
+        probes = self.hits + self.misses
+        return {
+            "size_mb": self.size_mb,
+            "entries": len(self.data),
+            "probes": probes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / probes if probes else 0.0,
+            "stores": self.stores,
+            "fill_rate": self.fill_rate(),
+            "collisions": self.collisions,
+            "overwrites": self.overwrites,
+        }
+
+    def close(self):
+        self._finalizer()
@@ -0,0 +1,107 @@
+# /* TranspositionTable.py
+from array import array
+
+from data.classes.moves import NO_MOVE
+
+# bound types
+EXACT = 1
+LOWER = 2  # score is at least this (fail high)
+UPPER = 3  # score is at most this (fail low)
+
+# bytes per entry: 8 key + 8 score + 4 packed depth/bound/move/age
+ENTRY_BYTES = 20
+AGE_MASK = 0x3F
+
+
+class TranspositionTable:
+    """
+    Fixed-size hash table of search results keyed by Board.zobrist_key.
+    Entries live in flat arrays sized from a memory budget, so the table never grows.
+    Each bucket has two slots: a depth-preferred slot that only gives way to an equal
+    or deeper search (or an entry left over from an earlier move), and an
+    always-replace slot that takes everything else.
+    """
+    def __init__(self, size_mb=8):
+        self.size_mb = size_mb
+        self.buckets = max(1, int(size_mb * 1024 * 1024) // (2 * ENTRY_BYTES))
+        self.keys = array("Q", bytes(8 * 2 * self.buckets))
+        self.scores = array("d", bytes(8 * 2 * self.buckets))
+        # move | bound << 16 | depth << 18 | age << 26, 0 for an empty slot
+        self.data = array("I", bytes(4 * 2 * self.buckets))
+        self.age = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def clear(self):
+        size = 2 * self.buckets
+        self.keys = array("Q", bytes(8 * size))
+        self.scores = array("d", bytes(8 * size))
+        self.data = array("I", bytes(4 * size))
+        self.age = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def new_search(self):
+        # entries from earlier searches become replaceable in the depth-preferred slots
+        self.age = (self.age + 1) & AGE_MASK
+
+    def probe(self, key):
+        # (score, bound, depth, move) or None
+        slot = (key % self.buckets) * 2
+        keys = self.keys
+        if keys[slot] != key or not self.data[slot]:
+            slot += 1
+            if keys[slot] != key or not self.data[slot]:
+                self.misses += 1
+                return None
+        self.hits += 1
+        data = self.data[slot]
+        return self.scores[slot], data >> 16 & 3, data >> 18 & 0xFF, data & 0xFFFF
+
+    def get_move(self, key):
+        # best move stored for key without touching the hit counters, or NO_MOVE
+        slot = (key % self.buckets) * 2
+        for i in (slot, slot + 1):
+            if self.keys[i] == key and self.data[i]:
+                return self.data[i] & 0xFFFF
+        return NO_MOVE
+
+    def store(self, key, depth, score, bound, move=NO_MOVE):
+        slot = (key % self.buckets) * 2
+        data = self.data
+        old = data[slot]
+        if (
+            not old
+            or self.keys[slot] == key
+            or depth >= old >> 18 & 0xFF
+            or old >> 26 != self.age
+        ):
+            if move == NO_MOVE and self.keys[slot] == key:
+                move = old & 0xFFFF
+        else:
+            slot += 1
+        self.keys[slot] = key
+        self.scores[slot] = score
+        data[slot] = move | bound << 16 | min(depth, 0xFF) << 18 | self.age << 26
+        self.stores += 1
+
+    def fill_rate(self):
+        used = sum(1 for data in self.data if data)
+        return used / len(self.data)
+
+    def stats(self):
+        probes = self.hits + self.misses
+        return {
+            "size_mb": self.size_mb,
+            "entries": len(self.data),
+            "probes": probes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / probes if probes else 0.0,
+            "stores": self.stores,
+        }
@@ -0,0 +1,32 @@
+# /* iterative_deepening.py
+import time
+
+
+class SearchTimeout(Exception):
+    # raised from inside a search once its deadline has passed
+    pass
+
+
+def iterative_deepening(board, search_depth, max_depth, deadline):
+    """
+    Runs search_depth(depth, deadline) for depth 1, 2, 3... up to max_depth, where
+    deadline is a time.perf_counter() value. search_depth returns its result for a fully
+    searched depth, or raises SearchTimeout part way through, in which case the moves it
+    left pushed on board are popped and the unfinished depth is thrown away.
+    Depth 1 always runs to completion so there is a move to play.
+    Returns (result of the deepest completed depth, that depth).
+    """
+    stack_size = len(board.move_stack)
+    result = None
+    reached = 0
+    for depth in range(1, max_depth + 1):
+        if depth > 1 and time.perf_counter() >= deadline:
+            break
+        try:
+            result = search_depth(depth, deadline if depth > 1 else float("inf"))
+        except SearchTimeout:
+            while len(board.move_stack) > stack_size:
+                board.pop()
+            break
+        reached = depth
+    return result, reached
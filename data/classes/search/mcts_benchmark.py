@@ -0,0 +1,39 @@
+# /* mcts_benchmark.py
+# Playouts per second of the Monte Carlo tree search bot (bots/mcts_bot.py), over
+# positions reached by random play, each searched for the bot's usual time per move:
+#   python -m data.classes.search.mcts_benchmark --positions 20 --rollout-plies 4
+import argparse
+
+from data.classes.bots.mcts_bot import Bot
+from data.classes.search.parallel_benchmark import random_positions
+
+
+def run_benchmark(positions, rollout_plies=None):
+    bot = Bot()
+    if rollout_plies is not None:
+        bot.rollout_plies = rollout_plies
+    for board in positions:
+        # a new tree for every position, as nothing carries over between them
+        bot.played = None
+        bot.move(board.turn, board)
+    playouts = sum(bot.playout_history)
+    seconds = sum(bot.time_history)
+    return {
+        "playouts": playouts,
+        "seconds": seconds,
+        "per_second": playouts / seconds,
+        "per_move": playouts / len(positions),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--positions", type=int, default=20, help="Number of positions, reached by random play")
+    parser.add_argument("--rollout-plies", type=int, default=None, help="Random moves per playout before the material count")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    positions = random_positions(args.positions, args.seed)
+    result = run_benchmark(positions, args.rollout_plies)
+    print(f"{len(positions)} positions, {result['seconds']:.2f}s")
+    print(f"{result['playouts']} playouts: {result['per_move']:.0f} per move, {result['per_second']:.0f} per second")
@@ -0,0 +1,107 @@
+# /* parallel_benchmark.py
+# Speedup and search overhead of the root-split parallel search (ParallelSearch)
+# against the same bot searching in one process, at a fixed depth with no time limit:
+#   python -m data.classes.search.parallel_benchmark --bot danbot --processes 4 --depth 5
+# Speedup is serial time / parallel time; overhead is the extra nodes the parallel
+# search visits, since workers start without the bounds and table entries that the
+# serial search carries from one root move to the next. By default the workers share
+# one hash table (SharedTranspositionTable); --private-tables gives each its own.
+import argparse
+import importlib
+import os
+import random
+import time
+
+from data.classes.Board import Board
+
+
+def random_positions(count, seed, min_plies=4, max_plies=14):
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = Board(600, 600)
+        for _ in range(rng.randrange(min_plies, max_plies)):
+            moves = board.get_all_valid_moves(board.turn)
+            if not moves or board.is_in_checkmate(board.turn):
+                break
+            board.push(rng.choice(moves))
+        if not board.is_in_checkmate(board.turn):
+            positions.append(board)
+    return positions
+
+
+def time_searches(bot, positions, depth):
+    # (seconds, nodes including quiescence) over all positions
+    bot.depth = depth
+    bot.time_limit_ms = float("inf")
+    seconds = nodes = 0
+    for board in positions:
+        start = time.perf_counter()
+        bot.move(board.turn, board)
+        seconds += time.perf_counter() - start
+        nodes += bot.nodes + bot.q_nodes
+    return seconds, nodes
+
+
+def run_benchmark(bot_class, processes, depth, positions, shared_table=True):
+    parallel = bot_class()
+    parallel.processes = processes
+    parallel.shared_table = shared_table
+    if parallel.worker_processes() == 0:
+        # the bot would search in this process only, timing serial against serial
+        raise ValueError(
+            f"no worker processes to benchmark: {os.cpu_count()} CPU(s), and the bot keeps one for its own search"
+        )
+    serial = bot_class()
+    serial_time, serial_nodes = time_searches(serial, positions, depth)
+    # start the pool before timing, as the simulator does before a game
+    parallel.start()
+    try:
+        parallel.tt.reset_stats()
+        parallel_time, parallel_nodes = time_searches(parallel, positions, depth)
+        table = parallel.tt.stats()
+    finally:
+        parallel.close()
+    return {
+        "workers": parallel.worker_processes(),
+        "table": table,
+        "serial_time": serial_time,
+        "parallel_time": parallel_time,
+        "speedup": serial_time / parallel_time,
+        "serial_nodes": serial_nodes,
+        "parallel_nodes": parallel_nodes,
+        "overhead": parallel_nodes / serial_nodes - 1,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bot", type=str, default="danbot", help="Bot module in data/classes/bots")
+    parser.add_argument("--processes", type=int, default=4, help="Worker processes for the parallel search")
+    parser.add_argument("--depth", type=int, default=5, help="Fixed search depth")
+    parser.add_argument("--positions", type=int, default=8, help="Number of positions, reached by random play")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--private-tables", action="store_true", help="A hash table per worker instead of one shared table")
+    args = parser.parse_args()
+
+    report = print
+    bot_class = importlib.import_module(f"data.classes.bots.{args.bot}").Bot
+    positions = random_positions(args.positions, args.seed)
+    try:
+        result = run_benchmark(bot_class, args.processes, args.depth, positions, not args.private_tables)
+    except ValueError as e:
+        parser.error(str(e))
+    if result["workers"] < args.processes:
+        report(f"only {result['workers']} of {args.processes} worker processes started, to leave this process a CPU")
+    report(f"{args.bot} depth {args.depth}, {len(positions)} positions, {result['workers']} worker processes")
+    report(f"serial:   {result['serial_time']:.2f}s {result['serial_nodes']} nodes")
+    report(f"parallel: {result['parallel_time']:.2f}s {result['parallel_nodes']} nodes")
+    report(f"speedup {result['speedup']:.2f}x, search overhead {100 * result['overhead']:+.1f}% nodes")
+    table = result["table"]
+    if "fill_rate" in table:
+        # shared table: fill is table-wide, the counters are this process's own probes and stores
+        report(
+            f"shared table: {table['size_mb']:.1f} MB, {100 * table['fill_rate']:.1f}% full, "
+            f"{table['collisions']} collisions in {table['probes']} probes, "
+            f"{table['overwrites']} overwrites in {table['stores']} stores"
+        )
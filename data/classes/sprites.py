@@ -0,0 +1,16 @@
+# /* sprites.py
+import pygame
+
+# process-wide cache of scaled piece images, keyed by (name, color, size);
+# each image is read from disk the first time something draws it
+_sprites = {}
+
+
+def get_sprite(name, color, size):
+    key = (name, color, size)
+    sprite = _sprites.get(key)
+    if sprite is None:
+        sprite = pygame.image.load("data/imgs/" + color[0] + "_" + name + ".png")
+        sprite = pygame.transform.scale(sprite, size)
+        _sprites[key] = sprite
+    return sprite
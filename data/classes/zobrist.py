@@ -0,0 +1,17 @@
+# /* zobrist.py
+# Random 64-bit keys for Zobrist hashing, indexed like BitBoard.mailbox codes
+# (color << 3 | piece type). The seed is fixed so every process (and every run)
+# agrees on the key of a position, which lets hash tables be shared or saved.
+import random
+
+_random = random.Random(20250406)
+
+
+def _key():
+    return _random.getrandbits(64)
+
+
+PIECE_KEYS = tuple(tuple(_key() for _ in range(36)) for _ in range(16))
+# pawns that can still make their double step
+UNMOVED_PAWN_KEYS = tuple(_key() for _ in range(36))
+BLACK_TO_MOVE_KEY = _key()
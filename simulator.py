@@ -1,14 +1,21 @@
-import pygame
 import argparse
 import importlib
 
 from data.classes.Board import Board
 
-pygame.init()
-
 
 WINDOW_SIZE = (600, 600)
-screen = pygame.display.set_mode(WINDOW_SIZE)
+# pygame and the window are only set up by open_window(), so --headless runs
+# need neither a display nor pygame itself
+pygame = None
+screen = None
+
+
+def open_window():
+    global pygame, screen
+    import pygame
+    pygame.init()
+    screen = pygame.display.set_mode(WINDOW_SIZE)
 
 
 def draw(display, board):
@@ -17,21 +24,56 @@ def draw(display, board):
     pygame.display.update()
 
 
-def run_game(bot1_class, bot2_class, delay):
+def print_search_stats(name, bot):
+    # bots that search with iterative deepening record the depth they completed per move
+    depths = getattr(bot, "depth_history", None)
+    if depths:
+        print(f"{name} search depth per move: avg {sum(depths) / len(depths):.2f}, min {min(depths)}, max {max(depths)}")
+    # (nodes, quiescence nodes) per move
+    nodes = getattr(bot, "node_history", None)
+    if nodes:
+        main = sum(n for n, _ in nodes)
+        quiet = sum(q for _, q in nodes)
+        share = 100 * quiet / (main + quiet) if main + quiet else 0
+        print(f"{name} nodes per move: avg {main / len(nodes):.0f} + {quiet / len(nodes):.0f} quiescence ({share:.0f}%)")
+    # Monte Carlo bots record the playouts they ran and the seconds they took per move
+    playouts = getattr(bot, "playout_history", None)
+    if playouts:
+        seconds = sum(bot.time_history)
+        print(f"{name} playouts per move: avg {sum(playouts) / len(playouts):.0f}, {sum(playouts) / seconds:.0f} per second")
+    if getattr(bot, "proof_search", False):
+        print(f"{name} forced king captures found by the proof-number pre-pass: {bot.proofs}")
+    if getattr(bot, "ponder", False):
+        guesses = bot.ponder_hits + bot.ponder_misses
+        rate = 100 * bot.ponder_hits / guesses if guesses else 0
+        print(f"{name} ponder hits: {bot.ponder_hits}/{guesses} ({rate:.0f}%)")
+
+
+def run_game(bot1_class, bot2_class, delay, names=("bot1", "bot2"), processes=0, ponder=False):
+    # plays one game, bot1 as black and bot2 as white; returns "black", "white" or "draw"
     board = Board(WINDOW_SIZE[0], WINDOW_SIZE[1])
     bot1 = bot1_class()
     bot2 = bot2_class()
-    running = True
-
-    while running:
-        mx, my = pygame.mouse.get_pos()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                board.handle_click(mx, my)
-                print(board.last_captured)
+    # SearchBot subclasses split their root moves over this many processes
+    for bot in (bot1, bot2):
+        if hasattr(bot, "processes"):
+            bot.processes = processes
+        if hasattr(bot, "ponder"):
+            bot.ponder = ponder
+        # start any worker processes now, not on the clock of the first move
+        if hasattr(bot, "start"):
+            bot.start()
+
+    while True:
+        if screen is not None:
+            mx, my = pygame.mouse.get_pos()
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    exit()
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    board.handle_click(mx, my)
+                    print(board.last_captured)
 
         if board.turn == "black":
             move = bot1.move("black", board)
@@ -39,19 +81,31 @@ def run_game(bot1_class, bot2_class, delay):
             move = bot2.move("white", board)
 
         board.handle_move(*move)
-        pygame.time.delay(delay)
-
+        # tell the bot to move next what its opponent played (e.g. to stop pondering)
+        next_bot = bot1 if board.turn == "black" else bot2
+        if hasattr(next_bot, "opponent_moved"):
+            next_bot.opponent_moved(move, board)
+        if screen is not None:
+            pygame.time.delay(delay)
+            draw(screen, board)
+
+        result = None
         if board.is_in_checkmate("black"):
             print("White wins!")
-            running = False
+            result = "white"
         elif board.is_in_checkmate("white"):
             print("Black wins!")
-            running = False
+            result = "black"
         elif board.is_in_draw():
             print("Draw!")
-            running = False
-
-        draw(screen, board)
+            result = "draw"
+        if result is not None:
+            print_search_stats(names[0], bot1)
+            print_search_stats(names[1], bot2)
+            for bot in (bot1, bot2):
+                if hasattr(bot, "close"):
+                    bot.close()
+            return result
 
 
 # ... [rest of the code remains unchanged above] ...
@@ -63,8 +117,14 @@ if __name__ == "__main__":
     parser.add_argument("--bot2", type=str, default="random_bot", help="Bot for white (e.g. 'random_bot')")
     parser.add_argument("--delay", type=int, default=0, help="Delay in ms between moves")
     parser.add_argument("--simulations", type=int, default=1, help="Number of simulations to run")
+    parser.add_argument("--headless", action="store_true", help="Run without a window (no pygame needed)")
+    parser.add_argument("--processes", type=int, default=0, help="Worker processes for bots with a parallel search")
+    parser.add_argument("--ponder", action="store_true", help="Let bots that can ponder search on the opponent's time")
     args = parser.parse_args()
 
+    if not args.headless:
+        open_window()
+
     try:
         bot1_module = importlib.import_module(f"data.classes.bots.{args.bot1}")
         bot2_module = importlib.import_module(f"data.classes.bots.{args.bot2}")
@@ -81,42 +141,9 @@ if __name__ == "__main__":
     for i in range(args.simulations):
         print(f"\n--- Starting Simulation {i + 1} ---")
 
-        def run_game_with_result():
-            board = Board(WINDOW_SIZE[0], WINDOW_SIZE[1])
-            bot1 = bot1_class()
-            bot2 = bot2_class()
-            running = True
-
-            while running:
-                mx, my = pygame.mouse.get_pos()
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        exit()
-                    elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                        board.handle_click(mx, my)
-                        print(board.last_captured)
-
-                if board.turn == "black":
-                    move = bot1.move("black", board)
-                else:
-                    move = bot2.move("white", board)
-
-                board.handle_move(*move)
-                pygame.time.delay(args.delay)
-                draw(screen, board)
-
-                if board.is_in_checkmate("black"):
-                    print("White wins!")
-                    return "white"
-                elif board.is_in_checkmate("white"):
-                    print("Black wins!")
-                    return "black"
-                elif board.is_in_draw():
-                    print("Draw!")
-                    return "draw"
-
-        result = run_game_with_result()
+        result = run_game(
+            bot1_class, bot2_class, args.delay, (args.bot1, args.bot2), args.processes, args.ponder
+        )
 
         if result == "black":
             bot1_wins += 1  # bot1 always plays black